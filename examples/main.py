@@ -31,7 +31,9 @@ def print_and_wait(text: str, sleep_time: int = 2) -> None:
 # check the docs of your device for further details and pin infos
 # this are the pins for the Raspberry Pi Pico adapter board
 i2c = I2C(0, scl=Pin(13), sda=Pin(12), freq=FREQ)
-lcd = LCD(addr=I2C_ADDR, cols=I2C_NUM_COLS, rows=I2C_NUM_ROWS, i2c=i2c)
+# the LCD calculates its timing with the same bus frequency
+lcd = LCD(addr=I2C_ADDR, cols=I2C_NUM_COLS, rows=I2C_NUM_ROWS, i2c=i2c,
+          freq=FREQ)
 
 # get LCD infos/properties
 print("LCD is on I2C address {}".format(lcd.addr))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Glyph animation playing a sequence of custom characters at a fixed rate
+
+Each step only writes the CGRAM rows differing from the previous frame by
+@see lcd_i2c.LCD.update_char, all cells showing the custom character are
+animated without writing to the DDRAM.
+"""
+
+# system packages
+from time import ticks_diff, ticks_ms
+
+# custom packages
+from .lcd_i2c import LCD
+from .timer import ScheduledTimer
+
+# typing not natively supported on MicroPython
+from .typing import List
+
+
+class GlyphAnimation:
+    """Play a sequence of charmaps on one custom character location"""
+
+    def __init__(self,
+                 lcd: LCD,
+                 frames: List[List[int]],
+                 location: int = 0,
+                 fps: int = 10,
+                 loop: bool = True) -> None:
+        """
+        Constructs a new instance.
+
+        :param      lcd:       The LCD, also an AsyncLCD
+        :type       lcd:       LCD
+        :param      frames:    The charmaps aka custom characters to play
+        :type       frames:    List[List[int]]
+        :param      location:  The location of the custom character
+        :type       location:  int
+        :param      fps:       The number of frames per second
+        :type       fps:       int
+        :param      loop:      Flag to restart after the last frame
+        :type       loop:      bool
+
+        :raises     ValueError:  No frames are given or the frame rate is not
+                                 positive
+        """
+        if not len(frames):
+            raise ValueError("No frames to play")
+        if fps <= 0:
+            raise ValueError("Frame rate has to be positive")
+
+        self._lcd = lcd
+        self._frames = frames
+        self._location: int = location & 0x7
+        self._period_ms: int = max(1000 // fps, 1)
+        self._loop: bool = loop
+        self._index: int = 0
+        self._running: bool = False
+        self._timer = ScheduledTimer(func=self._scheduled_step)
+
+    @property
+    def location(self) -> int:
+        """
+        Get the location of the animated custom character, print it with
+        chr(location)
+
+        :returns:   Location 0-7
+        :rtype:     int
+        """
+        return self._location
+
+    @property
+    def period_ms(self) -> int:
+        """
+        Get the time between two frames
+
+        :returns:   Frame period in milliseconds
+        :rtype:     int
+        """
+        return self._period_ms
+
+    @property
+    def running(self) -> bool:
+        """
+        Get the status of the animation task or timer
+
+        :returns:   Flag whether frames are scheduled
+        :rtype:     bool
+        """
+        return self._running
+
+    def step(self) -> bool:
+        """
+        Show the next frame on a synchronous LCD
+
+        :returns:   Flag whether further frames follow
+        :rtype:     bool
+        """
+        self._lcd.update_char(location=self._location,
+                              charmap=self._frames[self._index])
+        return self._advance()
+
+    async def run(self) -> None:
+        """
+        Play the frames until @see stop is called or the last frame is shown
+        without looping
+
+        Run this coroutine as asyncio task. Each frame is followed by a wait
+        for the remaining time of the frame period.
+        """
+        # asyncio is only imported if it is used, a timer works without it
+        from .async_lcd import AsyncLCD, sleep_ms
+
+        self._running = True
+        while self._running:
+            start = ticks_ms()
+            if isinstance(self._lcd, AsyncLCD):
+                await self._lcd.update_char(location=self._location,
+                                            charmap=self._frames[self._index])
+            else:
+                self._lcd.update_char(location=self._location,
+                                      charmap=self._frames[self._index])
+            if not self._advance():
+                self._running = False
+                break
+
+            remaining = self._period_ms - ticks_diff(ticks_ms(), start)
+            await sleep_ms(max(remaining, 0))
+
+    def start_timer(self, timer) -> None:
+        """
+        Play the frames on a synchronous LCD by a periodic timer
+
+        The steps are not done in the interrupt context of the timer, but
+        scheduled to run as soon as possible by the MicroPython VM.
+
+        :param      timer:  The timer, e.g. machine.Timer(0)
+        :type       timer:  machine.Timer
+        """
+        self._running = True
+        self._timer.start(timer=timer, period_ms=self._period_ms)
+
+    def stop(self) -> None:
+        """Stop the animation task or timer, the current frame is kept"""
+        self._running = False
+        self._timer.stop()
+
+    def _advance(self) -> bool:
+        """
+        Select the next frame
+
+        :returns:   Flag whether further frames follow
+        :rtype:     bool
+        """
+        self._index += 1
+        if self._index < len(self._frames):
+            return True
+
+        self._index = 0
+        return self._loop
+
+    def _scheduled_step(self) -> None:
+        """Step scheduled by the timer, unless stopped meanwhile"""
+        if self._running and not self.step():
+            self.stop()
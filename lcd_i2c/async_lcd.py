@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Asyncio I2C LCD Display driver for 1602 and 2004 displays controlled via I2C
+
+The frames are encoded by @see lcd_i2c.LCD, long delays like the power on
+delay, the initialization waits and the execution of clear display or return
+home are awaited instead of blocking all other tasks.
+"""
+
+# system packages
+from asyncio import Lock, current_task, sleep_ms
+from time import ticks_diff, ticks_us
+
+# custom packages
+from .lcd_i2c import LCD
+
+# typing not natively supported on MicroPython
+from .typing import Dict, List
+
+
+class AsyncLCD(LCD):
+    """
+    Asyncio driver for the Liquid Crystal LCD displays that use the I2C bus
+
+    @see begin, @see clear, @see home, @see print, @see set_cursor,
+    @see create_char, @see create_chars, @see load_charset, @see update_char
+    and @see show are coroutines, all other methods of @see lcd_i2c.LCD are
+    inherited unchanged.
+
+    Every coroutine holds a lock while it sends, so several tasks can share
+    one display. To keep a sequence of calls, e.g. setting the cursor and
+    printing, together use the display as asynchronous context manager
+
+    async with lcd:
+        await lcd.set_cursor(col=0, row=1)
+        await lcd.print("Hello")
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Constructs a new instance, @see lcd_i2c.LCD for the arguments
+        """
+        super().__init__(*args, **kwargs)
+        self._lock = Lock()
+        # task holding the lock via the asynchronous context manager
+        self._owner = None
+
+    async def __aenter__(self) -> 'AsyncLCD':
+        """Hold the lock for the current task"""
+        await self._lock.acquire()
+        self._owner = current_task()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Release the lock held by the current task"""
+        self._owner = None
+        self._lock.release()
+
+    async def begin(self, fast: bool = False) -> None:
+        """
+        Set the LCD display in the correct begin state
+
+        Must be called before anything else is done. The same sequence as
+        by @see lcd_i2c.LCD.begin is sent, the power on delays and the long
+        execution times are awaited instead.
+
+        :param      fast:  Flag to use the fast initialization sequence
+        :type       fast:  bool
+        """
+        locked = await self._acquire()
+        try:
+            start = ticks_us()
+            # the busy flag is not polled until it has been probed afterwards
+            busy_flag = self._busy_flag
+            self._busy_flag = False
+
+            for delay_ms in self._init_steps(fast=fast):
+                if delay_ms:
+                    await sleep_ms(delay_ms)
+                await self._ready()
+
+            if busy_flag:
+                self._busy_flag = self._probe_busy_flag()
+
+            self._init_time_us = ticks_diff(ticks_us(), start)
+        finally:
+            self._release(locked)
+
+    async def clear(self) -> None:
+        """
+        Remove all the characters currently shown
+
+        @see lcd_i2c.LCD.clear
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            LCD.clear(self)
+        finally:
+            self._release(locked)
+
+    async def home(self) -> None:
+        """
+        Set cursor to home position (0, 0)
+
+        @see lcd_i2c.LCD.home
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            LCD.home(self)
+        finally:
+            self._release(locked)
+
+    async def set_cursor(self, col: int, row: int) -> None:
+        """
+        Set the cursor
+
+        :param      col:  The new column of the cursor
+        :type       col:  int
+        :param      row:  The new row of the cursor
+        :type       row:  int
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            self._set_cursor(col=col, row=row)
+        finally:
+            self._release(locked)
+
+    async def create_char(self, location: int, charmap: List[int]) -> None:
+        """
+        Fill the first 8 CGRAM locations with custom characters
+
+        :param      location:  The location to store the custom character
+        :type       location:  int
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            self._create_char(location=location, charmap=charmap)
+        finally:
+            self._release(locked)
+
+    async def create_chars(self, charmaps: Dict[int, List[int]]) -> None:
+        """
+        Fill several CGRAM locations with custom characters at once
+
+        @see lcd_i2c.LCD.create_chars
+
+        :param      charmaps:  The charmaps aka custom characters by location
+        :type       charmaps:  Dict[int, List[int]]
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            self._create_chars(charmaps=charmaps)
+        finally:
+            self._release(locked)
+
+    async def load_charset(self, charset: List[List[int]]) -> None:
+        """
+        Fill the CGRAM locations from 0 with a set of custom characters
+
+        @see lcd_i2c.LCD.load_charset
+
+        :param      charset:  The charmaps aka custom characters, up to 8
+        :type       charset:  List[List[int]]
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            LCD.load_charset(self, charset=charset)
+        finally:
+            self._release(locked)
+
+    async def update_char(self, location: int, charmap: List[int]) -> None:
+        """
+        Update a custom character by writing only its changed rows
+
+        @see lcd_i2c.LCD.update_char
+
+        :param      location:  The location of the custom character
+        :type       location:  int
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            self._update_chars(charmaps={location: charmap})
+        finally:
+            self._release(locked)
+
+    async def print(self, text: str) -> None:
+        """
+        Print text on LCD
+
+        The text is sent in chunks of one row of columns, other tasks are run
+        between the chunks.
+
+        :param      text: Text to show on the LCD
+        :type       text: str
+        """
+        locked = await self._acquire()
+        try:
+            for start in range(0, len(text), self._cols):
+                await self._ready()
+                LCD.print(self, text=text[start:start + self._cols])
+                await sleep_ms(0)
+        finally:
+            self._release(locked)
+
+    async def show(self) -> None:
+        """
+        Send the changed cells of the framebuffer to the LCD
+
+        @see lcd_i2c.LCD.show
+        """
+        locked = await self._acquire()
+        try:
+            await self._ready()
+            LCD.show(self)
+        finally:
+            self._release(locked)
+
+    async def _acquire(self) -> bool:
+        """
+        Acquire the lock unless the current task holds it already
+
+        :returns:   Flag whether the lock has been acquired
+        :rtype:     bool
+        """
+        if self._owner is not None and self._owner is current_task():
+            return False
+
+        await self._lock.acquire()
+        return True
+
+    def _release(self, locked: bool) -> None:
+        """
+        Release the lock if it has been acquired by @see _acquire
+
+        :param      locked:  The flag returned by @see _acquire
+        :type       locked:  bool
+        """
+        if locked:
+            self._lock.release()
+
+    async def _ready(self) -> None:
+        """
+        Await the whole milliseconds until the controller is ready
+
+        The remaining time is waited by @see lcd_i2c.LCD._wait_ready before
+        the next frame is sent.
+        """
+        remaining = ticks_diff(self._busy_until, ticks_us()) - \
+            self._latch_time_us
+        if remaining >= 1000:
+            await sleep_ms(remaining // 1000)
@@ -86,3 +86,64 @@ EN = const(0b00000100)
 RW = const(0b00000010)
 #: Register select bit
 RS = const(0b00000001)
+
+#: DDRAM address offsets of the rows
+ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
+# timing
+#: Execution time of most instructions and data writes in microseconds
+EXEC_TIME_US = const(37)
+#: Execution time of clear display and return home in microseconds
+EXEC_TIME_LONG_US = const(1520)
+#: Number of bits on the I2C bus per transferred byte incl. acknowledge
+BUS_BITS_PER_BYTE = const(9)
+#: Minimum time after power rises above 2.7V in milliseconds
+POWER_ON_DELAY_MS = const(40)
+#: Minimum time after the first 8 bit function set in microseconds
+INIT_FIRST_WAIT_US = const(4100)
+#: Minimum time after the second 8 bit function set in microseconds
+INIT_SECOND_WAIT_US = const(100)
+#: Padded time after each 8 bit function set of the default sequence in us
+INIT_SAFE_WAIT_US = const(4500)
+#: Maximum time to poll the busy flag before giving up in microseconds
+BUSY_TIMEOUT_US = const(10000)
+
+# flags for reading busy flag and address counter
+#: Busy flag bit
+LCD_BUSYFLAG = const(0x80)
+#: Address counter bits
+LCD_ADDRESSCOUNTER = const(0x7F)
+
+# framing
+#: Number of port expander bytes to transfer one byte (2 nibbles, 3 each)
+FRAME_SIZE = const(6)
+
+# state
+#: Identifier of a serialized driver state
+STATE_MAGIC = const(0x4C)
+#: Layout version of a serialized driver state
+STATE_VERSION = const(1)
+#: Size of the header of a serialized driver state in bytes
+STATE_HEADER_SIZE = const(13)
+#: Size of a serialized driver state incl. CGRAM and 80 cells in bytes
+STATE_SIZE = const(157)
+
+# write pump
+#: Block the caller until the queued frames fit into the ring buffer
+PUMP_BLOCK = const(0)
+#: Drop the oldest queued frames if the ring buffer is full
+PUMP_DROP_OLDEST = const(1)
+#: Defer showing the framebuffer until the ring buffer is empty
+PUMP_COALESCE = const(2)
+#: Resolution of the delays queued in the ring buffer in microseconds
+PUMP_DELAY_UNIT_US = const(100)
+
+# characters
+#: Character code of a blank cell
+CHAR_BLANK = const(0x20)
+#: Character code of the full block in the A00 character ROM
+CHAR_FULL_BLOCK = const(0xFF)
+#: Number of pixel columns of a character cell
+CHAR_WIDTH = const(5)
+#: Number of pixel rows of a character cell incl. the cursor row
+CHAR_HEIGHT = const(8)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Pseudo graphics drawing small bitmaps and bars with custom characters
+
+A bitmap spanning several cells is sliced into tiles of one cell. Blank tiles
+are shown as space, full tiles as the full block of the character ROM, all
+other tiles are deduplicated and stored in the custom character locations.
+Only changed CGRAM rows and cells are written for each frame. Bars share 4
+custom characters of partially filled cells and only write the cells whose
+fill changed.
+"""
+
+# custom packages
+from . import const as Const
+from .lcd_i2c import LCD
+
+# typing not natively supported on MicroPython
+from .typing import Dict, List, Optional
+
+# rows of a tile with all pixels set
+_FULL_TILE = bytes([0x1F] * Const.CHAR_HEIGHT)
+
+
+class TileRenderer:
+    """Draw bitmaps into an area of cells of a synchronous LCD"""
+
+    def __init__(self,
+                 lcd: LCD,
+                 col: int,
+                 row: int,
+                 width: int,
+                 height: int = 1,
+                 locations: Optional[List[int]] = None) -> None:
+        """
+        Constructs a new instance.
+
+        :param      lcd:        The LCD
+        :type       lcd:        LCD
+        :param      col:        The column of the top left cell
+        :type       col:        int
+        :param      row:        The row of the top left cell
+        :type       row:        int
+        :param      width:      The number of cells per row
+        :type       width:      int
+        :param      height:     The number of rows of cells
+        :type       height:     int
+        :param      locations:  The custom character locations to use, all 8
+                                if not given
+        :type       locations:  List[int]
+
+        :raises     ValueError:  The area is not on the display
+        """
+        if (col < 0 or row < 0 or width < 1 or height < 1 or
+                col + width > lcd.cols or row + height > lcd.rows):
+            raise ValueError("Area is not on the display")
+
+        self._lcd = lcd
+        self._col: int = col
+        self._row: int = row
+        self._width: int = width
+        self._height: int = height
+        if locations is None:
+            locations = list(range(0, 8))
+        self._locations: List[int] = [location & 0x7
+                                      for location in locations]
+
+        # character codes of the cells drawn last, unknown at first
+        self._codes = bytearray(width * height)
+        self._drawn: bool = False
+        self._tiles: int = 0
+
+    @property
+    def pixel_width(self) -> int:
+        """
+        Get the number of pixel columns of a bitmap
+
+        :returns:   Width of the bitmap in pixels
+        :rtype:     int
+        """
+        return self._width * Const.CHAR_WIDTH
+
+    @property
+    def pixel_height(self) -> int:
+        """
+        Get the number of pixel rows of a bitmap
+
+        :returns:   Height of the bitmap in pixels
+        :rtype:     int
+        """
+        return self._height * Const.CHAR_HEIGHT
+
+    @property
+    def tiles(self) -> int:
+        """
+        Get the number of custom characters needed by the last drawn bitmap
+
+        :returns:   Number of distinct tiles neither blank nor full
+        :rtype:     int
+        """
+        return self._tiles
+
+    def invalidate(self) -> None:
+        """Draw all cells with the next bitmap, e.g. after a clear"""
+        self._drawn = False
+
+    def draw(self, bitmap: List[int]) -> bool:
+        """
+        Draw a bitmap into the area
+
+        The bitmap is a list of @see pixel_height rows, each row an integer
+        of @see pixel_width bits with the most significant bit as leftmost
+        pixel. If the distinct tiles do not fit into the custom character
+        locations, nothing is drawn.
+
+        :param      bitmap:  The pixel rows
+        :type       bitmap:  List[int]
+
+        :returns:   Flag whether the bitmap has been drawn
+        :rtype:     bool
+        """
+        lcd = self._lcd
+        codes = bytearray(len(self._codes))
+        # distinct tiles by their rows and the cells showing them
+        tiles: Dict[bytes, List[int]] = {}
+
+        for cell in range(0, len(codes)):
+            tile = self._tile(bitmap=bitmap, cell=cell)
+            if not any(tile):
+                codes[cell] = Const.CHAR_BLANK
+            elif tile == _FULL_TILE:
+                codes[cell] = Const.CHAR_FULL_BLOCK
+            elif tile in tiles:
+                tiles[tile].append(cell)
+            else:
+                tiles[tile] = [cell]
+
+        self._tiles = len(tiles)
+        if len(tiles) > len(self._locations):
+            return False
+
+        charmaps = self._assign(tiles=tiles, codes=codes)
+        if charmaps:
+            # the cursor is set for the changed cells anyway, if there are any
+            unchanged = self._drawn and codes == self._codes
+            lcd._update_chars(charmaps=charmaps, restore=unchanged)
+
+        self._write_cells(codes=codes)
+        return True
+
+    def _tile(self, bitmap: List[int], cell: int) -> bytes:
+        """
+        Get the rows of the tile of a cell
+
+        :param      bitmap:  The pixel rows
+        :type       bitmap:  List[int]
+        :param      cell:    The index of the cell in the area
+        :type       cell:    int
+
+        :returns:   The 8 rows of the tile
+        :rtype:     bytes
+        """
+        top = (cell // self._width) * Const.CHAR_HEIGHT
+        shift = (self._width - 1 - cell % self._width) * Const.CHAR_WIDTH
+        return bytes((bitmap[top + y] >> shift) & 0x1F
+                     for y in range(0, Const.CHAR_HEIGHT))
+
+    def _assign(self,
+                tiles: Dict[bytes, List[int]],
+                codes: bytearray) -> Dict[int, List[int]]:
+        """
+        Assign the tiles to the custom character locations
+
+        Tiles already stored keep their location, the others take the free
+        location with the least differing rows.
+
+        :param      tiles:  The tiles and the cells showing them
+        :type       tiles:  Dict[bytes, List[int]]
+        :param      codes:  The character codes of the cells to be completed
+        :type       codes:  bytearray
+
+        :returns:   The charmaps to be written by location
+        :rtype:     Dict[int, List[int]]
+        """
+        cgram = self._lcd._cgram
+        valid = self._lcd._cgram_valid
+        free = list(self._locations)
+        pending = []
+
+        for tile in tiles:
+            for location in free:
+                if (valid & (1 << location) and
+                        cgram[location * 8:location * 8 + 8] == tile):
+                    free.remove(location)
+                    self._set_codes(codes=codes,
+                                    cells=tiles[tile],
+                                    location=location)
+                    break
+            else:
+                pending.append(tile)
+
+        charmaps = {}
+        for tile in pending:
+            best = free[0]
+            best_rows = Const.CHAR_HEIGHT + 1
+            for location in free:
+                rows = Const.CHAR_HEIGHT
+                if valid & (1 << location):
+                    rows = 0
+                    for y in range(0, Const.CHAR_HEIGHT):
+                        if cgram[location * 8 + y] != tile[y]:
+                            rows += 1
+                if rows < best_rows:
+                    best = location
+                    best_rows = rows
+            free.remove(best)
+            charmaps[best] = list(tile)
+            self._set_codes(codes=codes, cells=tiles[tile], location=best)
+
+        return charmaps
+
+    def _set_codes(self,
+                   codes: bytearray,
+                   cells: List[int],
+                   location: int) -> None:
+        """
+        Set the character code of cells showing a custom character
+
+        :param      codes:     The character codes of the cells
+        :type       codes:     bytearray
+        :param      cells:     The indices of the cells
+        :type       cells:     List[int]
+        :param      location:  The location of the custom character
+        :type       location:  int
+        """
+        for cell in cells:
+            codes[cell] = location
+
+    def _write_cells(self, codes: bytearray) -> None:
+        """
+        Print the runs of cells changed since the last drawn bitmap
+
+        :param      codes:  The character codes of the cells
+        :type       codes:  bytearray
+        """
+        lcd = self._lcd
+        last = self._codes
+        width = self._width
+
+        for row in range(0, self._height):
+            base = row * width
+            col = 0
+            while col < width:
+                if self._drawn and codes[base + col] == last[base + col]:
+                    col += 1
+                    continue
+
+                end = col + 1
+                while end < width and (not self._drawn or
+                                       codes[base + end] != last[base + end]):
+                    end += 1
+
+                lcd.set_cursor(col=self._col + col, row=self._row + row)
+                lcd.print("".join(chr(code) for code in codes[base + col:
+                                                              base + end]))
+                col = end
+
+        last[:] = codes
+        self._drawn = True
+
+
+class BarGraph:
+    """Horizontal bar with a resolution of one pixel column"""
+
+    def __init__(self,
+                 lcd: LCD,
+                 col: int,
+                 row: int,
+                 width: int,
+                 location: int = 0) -> None:
+        """
+        Constructs a new instance.
+
+        The partially filled cells use 4 custom characters starting at the
+        location, which are only written if they are not stored yet. Several
+        bars with the same location share them.
+
+        :param      lcd:       The LCD
+        :type       lcd:       LCD
+        :param      col:       The column of the leftmost cell
+        :type       col:       int
+        :param      row:       The row of the bar
+        :type       row:       int
+        :param      width:     The number of cells of the bar
+        :type       width:     int
+        :param      location:  The first of 4 custom character locations
+        :type       location:  int
+
+        :raises     ValueError:  The bar is not on the display or the custom
+                                 characters do not fit
+        """
+        if (col < 0 or row < 0 or row >= lcd.rows or width < 1 or
+                col + width > lcd.cols):
+            raise ValueError("Bar is not on the display")
+        if not 0 <= location <= 8 - (Const.CHAR_WIDTH - 1):
+            raise ValueError("Custom characters do not fit at location")
+
+        self._lcd = lcd
+        self._col: int = col
+        self._row: int = row
+        self._width: int = width
+        self._location: int = location
+        self._level: int = 0
+        self._drawn: bool = False
+
+        # cells filled with 1-4 pixel columns from the left
+        charmaps = {}
+        for filled in range(1, Const.CHAR_WIDTH):
+            value = (0x1F << (Const.CHAR_WIDTH - filled)) & 0x1F
+            charmaps[location + filled - 1] = [value] * Const.CHAR_HEIGHT
+        lcd._update_chars(charmaps=charmaps)
+
+    @property
+    def level(self) -> int:
+        """
+        Get the last drawn level
+
+        :returns:   Number of filled pixel columns
+        :rtype:     int
+        """
+        return self._level
+
+    @property
+    def max_level(self) -> int:
+        """
+        Get the level of a completely filled bar
+
+        :returns:   Number of pixel columns of the bar
+        :rtype:     int
+        """
+        return self._width * Const.CHAR_WIDTH
+
+    def invalidate(self) -> None:
+        """Draw all cells with the next level, e.g. after a clear"""
+        self._drawn = False
+
+    def set_level(self, level: int) -> None:
+        """
+        Fill the bar from the left up to a level
+
+        Only the cells whose fill changed since the last drawn level are
+        written, usually one or two.
+
+        :param      level:  The number of filled pixel columns, limited to
+                            0 and @see max_level
+        :type       level:  int
+        """
+        level = min(max(level, 0), self.max_level)
+        if self._drawn:
+            if level == self._level:
+                return
+            # cells filled between both levels
+            first = min(level, self._level) // Const.CHAR_WIDTH
+            last = (max(level, self._level) - 1) // Const.CHAR_WIDTH
+        else:
+            first = 0
+            last = self._width - 1
+
+        lcd = self._lcd
+        lcd.set_cursor(col=self._col + first, row=self._row)
+        lcd.print("".join(chr(self._code(level=level, cell=cell))
+                          for cell in range(first, last + 1)))
+        self._level = level
+        self._drawn = True
+
+    def set_value(self, value: int, maximum: int) -> None:
+        """
+        Fill the bar proportional to a value, e.g. a progress
+
+        :param      value:    The value
+        :type       value:    int
+        :param      maximum:  The value of a completely filled bar
+        :type       maximum:  int
+        """
+        self.set_level(level=(value * self.max_level // maximum))
+
+    def _code(self, level: int, cell: int) -> int:
+        """
+        Get the character code of a cell of the bar
+
+        :param      level:  The number of filled pixel columns
+        :type       level:  int
+        :param      cell:   The index of the cell in the bar
+        :type       cell:   int
+
+        :returns:   Character code of the cell
+        :rtype:     int
+        """
+        filled = min(max(level - cell * Const.CHAR_WIDTH, 0),
+                     Const.CHAR_WIDTH)
+        if filled == 0:
+            return Const.CHAR_BLANK
+        if filled == Const.CHAR_WIDTH:
+            return Const.CHAR_FULL_BLOCK
+        return self._location + filled - 1
@@ -6,19 +6,23 @@ I2C LCD Display driver for 1602 and 2004 displays controlled via I2C
 
 LCD data sheet: https://www.sparkfun.com/datasheets/LCD/HD44780.pdf
 
+All frames sent to the port expander are encoded into buffers allocated once
+in the constructor. Steady state printing, setting the cursor and creating
+custom characters does not allocate any buffers or retain any memory.
+
 Ported to MicroPython from
 https://github.com/fdebrabander/Arduino-LiquidCrystal-I2C-library
 """
 
 # system packages
 from machine import I2C
-from time import sleep, sleep_ms, sleep_us
+from time import sleep_ms, sleep_us, ticks_add, ticks_diff, ticks_us
 
 # custom packages
 from . import const as Const
 
 # typing not natively supported on MicroPython
-from .typing import List, Optional, Tuple, Union
+from .typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 
 class LCD:
@@ -29,7 +33,15 @@ class LCD:
                  cols: int,
                  rows: int,
                  charsize: int = 0x00,
-                 i2c: Optional[I2C] = None) -> None:
+                 i2c: Optional[I2C] = None,
+                 freq: int = 1000000,
+                 busy_flag: bool = False,
+                 framebuffer: bool = False,
+                 vectored: bool = False,
+                 max_transfer: int = 0,
+                 max_hold_us: int = 0,
+                 bus_lock=None,
+                 yield_hook: Optional[Callable[[], None]] = None) -> None:
         """
         Constructs a new instance.
 
@@ -43,6 +55,31 @@ class LCD:
         :type       charsize:  int
         :param      i2c:       I2C object
         :type       i2c:       I2C
+        :param      freq:      The I2C bus frequency in Hz used for timing,
+                               must not be lower than the frequency of the
+                               I2C object. The default of 1 MHz only waits
+                               longer than needed on slower buses
+        :type       freq:      int
+        :param      busy_flag: Flag to poll the busy flag via the R/W line
+        :type       busy_flag: bool
+        :param      framebuffer:  Flag to print into a framebuffer
+        :type       framebuffer:  bool
+        :param      vectored:  Flag to send frames with I2C.writevto if the
+                               I2C object provides it, the prepared vectors
+                               take about 10 kB of RAM
+        :type       vectored:  bool
+        :param      max_transfer:  The maximum size of an I2C transaction in
+                                   bytes, 0 for one row of columns
+        :type       max_transfer:  int
+        :param      max_hold_us:   The maximum bus time of an I2C transaction
+                                   in microseconds, 0 for no limit
+        :type       max_hold_us:   int
+        :param      bus_lock:      Lock held during each I2C transaction,
+                                   e.g. _thread.allocate_lock()
+        :type       bus_lock:      Lock with acquire and release
+        :param      yield_hook:    Function called after each transaction
+                                   sending frames, e.g. to read sensors
+        :type       yield_hook:    Callable[[], None]
         """
         self._addr: int = addr
         self._cols: int = cols
@@ -54,11 +91,115 @@ class LCD:
             self._i2c = I2C(0)
         else:
             self._i2c = i2c
+        self._freq: int = freq
 
         self._display_control: int = 0
         self._display_mode: int = 0
         self._display_function: int = 0
-        self._cursor_position: Tuple[int, int] = (0, 0)  # (x, y)
+        self._cursor_col: int = 0
+        self._cursor_row: int = 0
+        # DDRAM address counter of the controller, -1 if unknown
+        self._address: int = -1
+        # number of positions the display is shifted left, -1 if unknown
+        self._shift: int = -1
+
+        # last state sent to the display and optional framebuffer, one byte
+        # per cell starting with the first row
+        self._shadow = bytearray(b' ' * (rows * cols))
+        # shadow matches the DDRAM and DDRAM outside of the shown cells is
+        # blank, which is only known after clearing the display
+        self._shadow_valid: bool = False
+        # shadow matches the shown cells after a complete render, the DDRAM
+        # outside of them is unknown
+        self._cells_valid: bool = False
+        self._blank = bytearray(b' ' * (rows * cols))
+        self._framebuffer: Optional[bytearray] = None
+        if framebuffer:
+            self._framebuffer = bytearray(b' ' * (rows * cols))
+
+        # rows of the 8 custom characters and mask of the written ones
+        self._cgram = bytearray(64)
+        self._cgram_valid: int = 0
+        # last use of each custom character for the least recently used one
+        self._cgram_used: List[int] = [0] * 8
+        self._glyph_clock: int = 0
+
+        # scratch buffers reused for every frame, sized for one row of text
+        # and a leading instruction to set the address
+        self._byte_buf = bytearray(1)
+        self._read_buf = bytearray(1)
+        self._strobe_buf = bytearray(2)
+        self._buf = bytearray((cols + 1) * Const.FRAME_SIZE)
+        _mv = memoryview(self._buf)
+        # slicing a memoryview allocates, so all frame lengths are prepared
+        self._frames: List[memoryview] = [
+            _mv[:num * Const.FRAME_SIZE] for num in range(0, cols + 2)
+        ]
+        # first half of a frame, e.g. a single nibble
+        self._half_frame: memoryview = _mv[:Const.FRAME_SIZE // 2]
+        # number of frames encoded into the buffer but not yet sent
+        self._pending: int = 0
+
+        # ready to send frames of every byte for instructions and data
+        self._lut = bytearray(2 * 256 * Const.FRAME_SIZE)
+        self._lut_mv = memoryview(self._lut)
+        self._build_lut()
+
+        # frames are sent as vector of lookup table entries instead of being
+        # copied into the frame buffer, if the bus supports scatter-gather
+        self._vectored: bool = vectored and hasattr(self._i2c, 'writevto')
+        self._lut_frames: List[memoryview] = []
+        self._slots: List[memoryview] = []
+        self._vectors: List[List[memoryview]] = []
+        if self._vectored:
+            self._lut_frames = [
+                self._lut_mv[idx:idx + Const.FRAME_SIZE]
+                for idx in range(0, len(self._lut), Const.FRAME_SIZE)
+            ]
+            self._slots = [self._lut_frames[0]] * (cols + 1)
+            # writevto sends all buffers, so all vector lengths are prepared
+            self._vectors = [
+                [self._lut_frames[0]] * num for num in range(0, cols + 2)
+            ]
+
+        # the controller is busy until this ticks_us deadline
+        self._busy_until: int = ticks_us()
+        # bus time until the first byte of a frame is latched by EN low
+        self._latch_time_us: int = \
+            (1 + Const.FRAME_SIZE // 2) * Const.BUS_BITS_PER_BYTE * \
+            1000000 // freq
+        # consecutive frames in one transaction must not be faster than the
+        # controller executes them, otherwise send them one by one
+        frame_time_us = \
+            Const.FRAME_SIZE * Const.BUS_BITS_PER_BYTE * 1000000 // freq
+        if frame_time_us < Const.EXEC_TIME_US:
+            self._max_frames_per_write: int = 1
+        else:
+            self._max_frames_per_write = cols + 1
+        self._frames_per_write: int = self._max_frames_per_write
+        self._max_transfer: int = 0
+        self._frame_time_us: int = max(frame_time_us, Const.EXEC_TIME_US)
+
+        # duration of the last begin or resume call
+        self._init_time_us: int = 0
+        # display function, control and mode have been set
+        self._configured: bool = False
+
+        # polling takes 3 writes and 2 reads of in total 12 bytes incl. addr
+        self._busy_flag: bool = busy_flag
+        self._poll_time_us: int = \
+            12 * Const.BUS_BITS_PER_BYTE * 1000000 // freq
+
+        # nesting depth of batches, frames are only sent if the buffer is
+        # full or before a long instruction is executed
+        self._batch_depth: int = 0
+
+        self._max_hold_us: int = max_hold_us
+        self.max_transfer = max_transfer
+
+        # other devices on the bus get it between the transactions
+        self._bus_lock = bus_lock
+        self._yield_hook: Optional[Callable[[], None]] = yield_hook
 
     @property
     def addr(self) -> int:
@@ -100,6 +241,49 @@ class LCD:
         """
         return self._charsize
 
+    @property
+    def freq(self) -> int:
+        """
+        Get the I2C bus frequency used for timing
+
+        :returns:   I2C bus frequency in Hz
+        :rtype:     int
+        """
+        return self._freq
+
+    @property
+    def framebuffer(self) -> Optional[bytearray]:
+        """
+        Get the framebuffer
+
+        :returns:   One byte per cell starting with the first row, None if not
+                    in framebuffer mode
+        :rtype:     Optional[bytearray]
+        """
+        return self._framebuffer
+
+    @property
+    def init_time_us(self) -> int:
+        """
+        Get the measured duration of the last @see begin or @see resume call
+
+        :returns:   Initialization time in microseconds
+        :rtype:     int
+        """
+        return self._init_time_us
+
+    @property
+    def busy_flag(self) -> bool:
+        """
+        Get the busy flag polling status
+
+        Polling is disabled by @see begin if the R/W pin is tied low
+
+        :returns:   Flag whether the busy flag is polled for long waits
+        :rtype:     bool
+        """
+        return self._busy_flag
+
     @property
     def backlightval(self) -> int:
         """
@@ -110,6 +294,71 @@ class LCD:
         """
         return self._backlightval
 
+    @property
+    def max_transfer(self) -> int:
+        """
+        Get the maximum size of an I2C transaction
+
+        :returns:   Maximum number of bytes, 0 for one row of columns
+        :rtype:     int
+        """
+        return self._max_transfer
+
+    @max_transfer.setter
+    def max_transfer(self, size: int) -> None:
+        """
+        Set the maximum size of an I2C transaction
+
+        Larger writes are split into several transactions, but never within
+        the frame of a byte, so at least one frame is sent at once. Smaller
+        transactions reduce the latency for other devices on the bus.
+
+        :param      size:  The maximum number of bytes, 0 for one row of
+                           columns
+        :type       size:  int
+        """
+        self._flush(force=True)
+        self._max_transfer = size
+        self._update_frames_per_write()
+
+    @property
+    def max_hold_us(self) -> int:
+        """
+        Get the maximum bus time of an I2C transaction
+
+        :returns:   Maximum bus time in microseconds, 0 for no limit
+        :rtype:     int
+        """
+        return self._max_hold_us
+
+    @max_hold_us.setter
+    def max_hold_us(self, duration: int) -> None:
+        """
+        Set the maximum bus time of an I2C transaction
+
+        The bus time is calculated from the bus frequency, at least the frame
+        of one byte is sent at once, @see max_transfer
+
+        :param      duration:  The maximum bus time in microseconds, 0 for no
+                               limit
+        :type       duration:  int
+        """
+        self._flush(force=True)
+        self._max_hold_us = duration
+        self._update_frames_per_write()
+
+    def _update_frames_per_write(self) -> None:
+        """Limit the frames per transaction by size and bus time"""
+        frames = self._max_frames_per_write
+        if self._max_transfer > 0:
+            frames = min(frames, self._max_transfer // Const.FRAME_SIZE)
+        if self._max_hold_us > 0:
+            frames = min(frames,
+                         self._max_hold_us * self._freq //
+                         (Const.FRAME_SIZE * Const.BUS_BITS_PER_BYTE *
+                          1000000))
+        self._frames_per_write = max(frames, 1)
+
     @property
     def cursor_position(self) -> Tuple[int, int]:
         """
@@ -118,7 +367,7 @@ class LCD:
         :returns:   Cursor position as tuple(column, row) as (x, y)
         :rtype:     Tuple[int, int]
         """
-        return self._cursor_position
+        return (self._cursor_col, self._cursor_row)
 
     @cursor_position.setter
     def cursor_position(self, position: Tuple[int, int]) -> None:
@@ -128,14 +377,129 @@ class LCD:
         :param      position:  The cursor position
         :type       position:  Tuple[int, int]
         """
-        self.set_cursor(col=position[0], row=position[1])   # (x, y)
+        self._set_cursor(col=position[0], row=position[1])  # (x, y)
+
+    def batch(self) -> 'LCD':
+        """
+        Get a context manager collecting the frames of several calls
+
+        All frames encoded inside the block are sent with as few I2C
+        transactions as possible when the block is left. The transaction is
+        only split if the frame buffer of one row of columns is full or after
+        a long instruction like clear display or return home, which has to be
+        executed before the next frame is sent.
+
+        with lcd.batch():
+            lcd.set_cursor(col=0, row=1)
+            lcd.print("Hello")
+            lcd.cursor()
+            lcd.blink()
+
+        :returns:   The LCD as context manager
+        :rtype:     LCD
+        """
+        return self
+
+    def __enter__(self) -> 'LCD':
+        """Start collecting the frames, batches can be nested"""
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Send the collected frames when leaving the outermost batch"""
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._flush()
 
-    def begin(self) -> None:
+    def begin(self, fast: bool = False) -> None:
         """
         Set the LCD display in the correct begin state
 
-        Must be called before anything else is done
+        Must be called before anything else is done. The default sequence is
+        padded like the Arduino library and takes more than one second. The
+        fast sequence uses the datasheet minimum timings and batches the
+        instructions into as few I2C transactions as possible.
+
+        @see init_time_us for the measured duration
+
+        :param      fast:  Flag to use the fast initialization sequence
+        :type       fast:  bool
+        """
+        start = ticks_us()
+        # the busy flag is not polled until it has been probed afterwards
+        busy_flag = self._busy_flag
+        self._busy_flag = False
+
+        for delay_ms in self._init_steps(fast=fast):
+            if delay_ms:
+                sleep_ms(delay_ms)
+
+        if busy_flag:
+            self._busy_flag = self._probe_busy_flag()
+
+        self._init_time_us = ticks_diff(ticks_us(), start)
+
+    def resume(self) -> None:
         """
+        Adopt an already initialized display without clearing it
+
+        Use this instead of @see begin after a soft reset while the display
+        stayed powered, the shown content remains visible. The nibble phase of
+        the 4 bit interface is re-synchronized and the display function,
+        control and mode are restored, defaulting to the @see begin ones.
+
+        The address counter is unknown afterwards, the first @see set_cursor
+        always sets the address. The display content is only known if it has
+        been restored by @see set_state before, otherwise the next
+        @see show sends all cells.
+
+        The busy flag is probed after the sequence like by @see begin, which
+        sets the address counter to zero.
+        """
+        start = ticks_us()
+        # the busy flag is not polled until it has been probed afterwards
+        busy_flag = self._busy_flag
+        self._busy_flag = False
+        self._init_display_function()
+        if not self._configured:
+            self._display_control = \
+                Const.LCD_DISPLAYON | Const.LCD_CURSOROFF | Const.LCD_BLINKOFF
+            self._display_mode = \
+                Const.LCD_ENTRYLEFT | Const.LCD_ENTRYSHIFTDECREMENT
+            self._configured = True
+
+        # frames collected by a batch are sent first to keep the order
+        self._flush(force=True)
+
+        # Now we pull both RS and R/W low to begin commands
+        self._expander_write(value=self.backlightval)
+
+        # the first nibble either starts an instruction in 8 bit mode or in
+        # 4 bit mode, or completes a pending one with low nibble 0x3. The only
+        # slow one of those is return home, clear display is not possible.
+        # Afterwards the controller is in 8 bit mode or expects a high nibble,
+        # the following nibbles switch it to 8 bit and back to 4 bit mode.
+        self._write_nibble(value=0x03, exec_us=Const.EXEC_TIME_LONG_US)
+        self._write_nibble(value=0x03)
+        self._put_init_sequence()
+        self._put(value=(Const.LCD_ENTRYMODESET | self._display_mode))
+        self._flush()
+
+        # a pending return home may have been completed, which does not
+        # change an unshifted display or the DDRAM content
+        self._address = -1
+        if self._shift != 0:
+            self._shift = -1
+
+        if busy_flag:
+            # the probe reads the address counter, which has to be zero
+            self._set_address(address=0)
+            self._busy_flag = self._probe_busy_flag()
+
+        self._init_time_us = ticks_diff(ticks_us(), start)
+
+    def _init_display_function(self) -> None:
+        """Set the display function flags for the size of the display"""
         self._display_function = \
             Const.LCD_4BITMODE | Const.LCD_1LINE | Const.LCD_5x8DOTS
 
@@ -146,16 +510,49 @@ class LCD:
         if (self.charsize != 0) and (self.rows == 1):
             self._display_function |= Const.LCD_5x10DOTS
 
+    def _init_steps(self, fast: bool) -> Iterator:
+        """
+        Initialize the display step by step
+
+        The power on delays are yielded in milliseconds, the controller is
+        waited for before the next instruction by @see _wait_ready. Zero is
+        yielded after each instruction with a long execution time, so
+        @see begin sleeps and @see async_lcd.AsyncLCD.begin awaits the
+        yielded delays, the latter also the execution times.
+
+        :param      fast:  Flag to use the datasheet minimum timings
+        :type       fast:  bool
+
+        :returns:   The milliseconds to wait before the next step
+        :rtype:     Iterator
+        """
+        self._init_display_function()
+
+        if fast:
+            yield from self._fast_init_steps()
+        else:
+            yield from self._safe_init_steps()
+        self._configured = True
+
+        if self._framebuffer is not None:
+            self._fill(buf=self._framebuffer)
+
+    def _safe_init_steps(self) -> Iterator:
+        """
+        Initialize the display with the padded timings of Arduino
+
+        @see _init_steps
+        """
         # SEE PAGE 45/46 FOR INITIALIZATION SPECIFICATION!
         # according to datasheet, we need at least 40ms after power rises
         # above 2.7V before sending commands. Controller can turn on way before
         # 4.5V so we'll wait 50ms
-        sleep_ms(50)
+        yield 50
 
         # Now we pull both RS and R/W low to begin commands
         # reset expanderand turn backlight off (Bit 8 =1)
         self._expander_write(value=self.backlightval)
-        sleep(1)
+        yield 1000
 
         # put the LCD into 4 bit mode
         # this is according to the Hitachi HD44780 datasheet
@@ -163,11 +560,12 @@ class LCD:
 
         # we start in 8 bit mode, try to set 4 bit mode
         for _ in range(0, 3):
-            self._write_4_bits(value=(0x03 << 4))
-            sleep_us(4500)  # wait minimum 4.1ms
+            # wait minimum 4.1ms
+            self._write_nibble(value=0x03, exec_us=Const.INIT_SAFE_WAIT_US)
+            yield 0
 
         # finally, set to 4 bit interface
-        self._write_4_bits(value=(0x02 << 4))
+        self._write_nibble(value=0x02)
 
         # set number of lines, font size, etc
         self._command(value=(Const.LCD_FUNCTIONSET | self._display_function))
@@ -178,7 +576,8 @@ class LCD:
         self.display()
 
         # clear it off
-        self.clear()
+        self._clear_display()
+        yield 0
 
         # Initialize to default text direction (for roman languages)
         self._display_mode = \
@@ -187,31 +586,151 @@ class LCD:
         # set the entry mode
         self._command(value=(Const.LCD_ENTRYMODESET | self._display_mode))
 
-        self.home()
+        self._return_home()
+        yield 0
+
+    def _fast_init_steps(self) -> Iterator:
+        """
+        Initialize the display with the datasheet minimum timings
+
+        After the first two 8 bit function set nibbles, the remaining nibbles
+        and instructions up to clearing the display are sent in one
+        transaction, @see _put_init_sequence and @see _init_steps
+        """
+        yield Const.POWER_ON_DELAY_MS
+
+        # Now we pull both RS and R/W low to begin commands
+        self._expander_write(value=self.backlightval)
+
+        # we start in 8 bit mode, try to set 4 bit mode
+        self._write_nibble(value=0x03, exec_us=Const.INIT_FIRST_WAIT_US)
+        yield 0
+        self._write_nibble(value=0x03, exec_us=Const.INIT_SECOND_WAIT_US)
+
+        self._display_control = \
+            Const.LCD_DISPLAYON | Const.LCD_CURSOROFF | Const.LCD_BLINKOFF
+        self._display_mode = \
+            Const.LCD_ENTRYLEFT | Const.LCD_ENTRYSHIFTDECREMENT
+
+        self._put_init_sequence()
+        self._put(value=Const.LCD_CLEARDISPLAY)
+        self._flush(exec_us=Const.EXEC_TIME_LONG_US)
+        self._cleared()
+        yield 0
+
+        self._command(value=(Const.LCD_ENTRYMODESET | self._display_mode))
+
+    def _put_init_sequence(self) -> None:
+        """
+        Encode the last steps of the initialization by instruction
+
+        The last 8 bit function set nibble and the 4 bit function set nibble
+        are encoded as instruction 0x32 if the bus is slow enough to let the
+        controller execute the first nibble before the second is latched,
+        otherwise they are sent one by one. The function set and display
+        control instructions follow.
+        """
+        nibble_time_us = (Const.FRAME_SIZE // 2) * Const.BUS_BITS_PER_BYTE * \
+            1000000 // self._freq
+        if nibble_time_us >= Const.EXEC_TIME_US:
+            self._put(value=0x32)
+        else:
+            self._write_nibble(value=0x03)
+            self._write_nibble(value=0x02)
+
+        self._put(value=(Const.LCD_FUNCTIONSET | self._display_function))
+        self._put(value=(Const.LCD_DISPLAYCONTROL | self._display_control))
 
     def clear(self) -> None:
         """
         Remove all the characters currently shown
 
         Next print/write operation will start from the first position on LCD
-        display.
+        display. In framebuffer mode only the framebuffer is cleared.
+
+        If the content of the display is known, only the non blank cells are
+        overwritten with spaces if this is faster than the clear instruction.
         """
-        # clear display and set cursor position to zero
-        self._command(value=Const.LCD_CLEARDISPLAY)
-        sleep_ms(2)     # this command takes a long time!
-        self._cursor_position = (0, 0)   # (x, y)
+        if self._framebuffer is not None:
+            self._fill(buf=self._framebuffer)
+            self._cursor_col = 0
+            self._cursor_row = 0
+        elif self._overwrite_cheaper():
+            self._render(target=self._blank)
+            self._set_address(address=0)
+            self._cursor_col = 0
+            self._cursor_row = 0
+        else:
+            self._clear_display()
 
     def home(self) -> None:
         """
         Set cursor to home position (0, 0)
 
         Next print/write operation will start from the first position on the
-        LCD display.
+        LCD display. In framebuffer mode only the cursor is set.
+
+        If the display is not shifted, the DDRAM address is set instead of
+        using the slow return home instruction.
+        """
+        if self._framebuffer is not None:
+            self._cursor_col = 0
+            self._cursor_row = 0
+        elif self._shift == 0:
+            self._set_address(address=0)
+            self._cursor_col = 0
+            self._cursor_row = 0
+        else:
+            self._return_home()
+
+    def _clear_display(self) -> None:
+        """Clear the display and set the cursor position to zero"""
+        # this command takes a long time!
+        self._command(value=Const.LCD_CLEARDISPLAY,
+                      exec_us=Const.EXEC_TIME_LONG_US)
+        self._cleared()
+
+    def _cleared(self) -> None:
+        """Reset the modelled display state after clearing the display"""
+        self._fill(buf=self._shadow)
+        self._shadow_valid = True
+        self._address = 0
+        self._shift = 0
+        self._cursor_col = 0
+        self._cursor_row = 0
+
+    def _return_home(self) -> None:
+        """Set the cursor position to zero"""
+        # this command takes a long time!
+        self._command(value=Const.LCD_RETURNHOME,
+                      exec_us=Const.EXEC_TIME_LONG_US)
+        self._address = 0
+        self._shift = 0
+        self._cursor_col = 0
+        self._cursor_row = 0
+
+    def _overwrite_cheaper(self) -> bool:
+        """
+        Check overwriting the non blank cells is faster than clearing
+
+        Requires known display content, no display shift and left to right
+        text flow without autoscroll.
+
+        :returns:   Flag whether the non blank cells shall be overwritten
+        :rtype:     bool
         """
-        # set cursor position to zero
-        self._command(value=Const.LCD_RETURNHOME)
-        sleep_ms(2)     # this command takes a long time!
-        self._cursor_position = (0, 0)   # (x, y)
+        if not self._shadow_valid or self._shift != 0:
+            return False
+        if (self._display_mode & (Const.LCD_ENTRYLEFT |
+                                  Const.LCD_ENTRYSHIFTINCREMENT) !=
+                Const.LCD_ENTRYLEFT):
+            return False
+
+        # overwriting needs an additional instruction to set the address
+        frames = self._count_frames(target=self._blank) + 1
+
+        return frames * self._frame_time_us < \
+            self._frame_time_us + Const.EXEC_TIME_LONG_US
 
     def no_display(self) -> None:
         """
@@ -304,25 +823,46 @@ class LCD:
         :param      row:  The new row of the cursor
         :type       row:  int
         """
-        row_offsets: List[int] = [0x00, 0x40, 0x14, 0x54]
+        self._set_cursor(col=col, row=row)
+
+    def _set_cursor(self, col: int, row: int) -> None:
+        """
+        Set the cursor, used internally as @see set_cursor may be overridden
 
+        :param      col:  The new column of the cursor
+        :type       col:  int
+        :param      row:  The new row of the cursor
+        :type       row:  int
+        """
         # we count rows starting w/0
         if row > (self.rows - 1):
             row = self.rows - 1
 
-        self._command(
-            value=(Const.LCD_SETDDRAMADDR | (col + row_offsets[row]))
-        )
+        if self._framebuffer is None:
+            self._set_address(address=(col + Const.ROW_OFFSETS[row]))
 
-        self._cursor_position = (col, row)   # (x, y)
+        self._cursor_col = col
+        self._cursor_row = row
 
     def scroll_display_left(self) -> None:
         """Scroll the display to the left by one"""
         self._command(value=(Const.LCD_CURSORSHIFT | Const.LCD_DISPLAYMOVE | Const.LCD_MOVELEFT))   # noqa: E501
+        self._shift_display(count=1)
 
     def scroll_display_right(self) -> None:
         """Scroll the display to the right by one"""
         self._command(value=(Const.LCD_CURSORSHIFT | Const.LCD_DISPLAYMOVE | Const.LCD_MOVERIGHT))  # noqa: E501
+        self._shift_display(count=-1)
+
+    def _shift_display(self, count: int) -> None:
+        """
+        Model the display shift, positive values are shifts to the left
+
+        :param      count:  The number of positions
+        :type       count:  int
+        """
+        if self._shift >= 0:
+            self._shift = (self._shift + count) % 40
 
     def left_to_right(self) -> None:
         """Set text flow left to right"""
@@ -336,12 +876,20 @@ class LCD:
 
     def no_backlight(self) -> None:
         """Turn backlight off"""
-        self._backlightval = Const.LCD_NOBACKLIGHT
+        # frames collected by a batch are sent first to keep the order
+        self._flush(force=True)
+        if self._backlightval != Const.LCD_NOBACKLIGHT:
+            self._backlightval = Const.LCD_NOBACKLIGHT
+            self._build_lut()
         self._expander_write(value=0)
 
     def backlight(self) -> None:
         """Turn backlight on"""
-        self._backlightval = Const.LCD_BACKLIGHT
+        # frames collected by a batch are sent first to keep the order
+        self._flush(force=True)
+        if self._backlightval != Const.LCD_BACKLIGHT:
+            self._backlightval = Const.LCD_BACKLIGHT
+            self._build_lut()
         self._expander_write(value=0)
 
     def set_backlight(self, new_val: Union[int, bool]) -> None:
@@ -379,6 +927,18 @@ class LCD:
         """
         Fill the first 8 CGRAM locations with custom characters
 
+        :param      location:  The location to store the custom character
+        :type       location:  int
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+        """
+        self._create_char(location=location, charmap=charmap)
+
+    def _create_char(self, location: int, charmap: List[int]) -> None:
+        """
+        Fill a CGRAM location, used internally as @see create_char may be
+        overridden
+
         :param      location:  The location to store the custom character
         :type       location:  int
         :param      charmap:   The charmap aka custom character
@@ -387,37 +947,848 @@ class LCD:
         location &= 0x7     # we only have 8, locations 0-7
 
         self._command(value=(Const.LCD_SETCGRAMADDR | location << 3))
-        sleep_us(40)
+        # address counter points to CGRAM now
+        self._address = -1
 
         for x in range(0, 8):
             self._command(value=charmap[x], mode=Const.RS)
-            sleep_us(40)
+            self._cgram[location * 8 + x] = charmap[x] & 0x1F
+        self._cgram_valid |= 1 << location
+        self._use_glyph(location=location)
+
+    def create_chars(self, charmaps: Dict[int, List[int]]) -> None:
+        """
+        Fill several CGRAM locations with custom characters at once
+
+        The CGRAM address is only set before the first location and after a
+        gap between the locations, all rows are streamed using the auto
+        increment of the address counter with as few I2C transactions as
+        possible. A known DDRAM address is restored afterwards.
+
+        :param      charmaps:  The charmaps aka custom characters by location
+        :type       charmaps:  Dict[int, List[int]]
+        """
+        self._create_chars(charmaps=charmaps)
+
+    def load_charset(self, charset: List[List[int]]) -> None:
+        """
+        Fill the CGRAM locations from 0 with a set of custom characters
+
+        @see create_chars
+
+        :param      charset:  The charmaps aka custom characters, up to 8
+        :type       charset:  List[List[int]]
+        """
+        charmaps = {}
+        for location, charmap in enumerate(charset[:8]):
+            charmaps[location] = charmap
+        self._create_chars(charmaps=charmaps)
+
+    def update_char(self, location: int, charmap: List[int]) -> None:
+        """
+        Update a custom character by writing only its changed rows
+
+        The charmap is compared with the last one written to the location,
+        the CGRAM address is only set before the first changed row and after
+        unchanged rows. A location not written yet is filled completely. A
+        known DDRAM address is restored afterwards.
+
+        :param      location:  The location of the custom character
+        :type       location:  int
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+        """
+        self._update_chars(charmaps={location: charmap})
+
+    def _create_chars(self, charmaps: Dict[int, List[int]]) -> None:
+        """
+        Fill several CGRAM locations, used internally as @see create_chars
+        may be overridden
+
+        :param      charmaps:  The charmaps aka custom characters by location
+        :type       charmaps:  Dict[int, List[int]]
+        """
+        self._write_cgram(charmaps=charmaps, changed_only=False)
+
+    def _update_chars(self,
+                      charmaps: Dict[int, List[int]],
+                      restore: bool = True) -> None:
+        """
+        Write the changed rows of several CGRAM locations, used internally as
+        @see update_char may be overridden
+
+        :param      charmaps:  The charmaps aka custom characters by location
+        :type       charmaps:  Dict[int, List[int]]
+        :param      restore:   Flag to restore the DDRAM address, not needed
+                               if the cursor is set afterwards
+        :type       restore:   bool
+        """
+        self._write_cgram(charmaps=charmaps,
+                          changed_only=True,
+                          restore=restore)
+
+    def _write_cgram(self,
+                     charmaps: Dict[int, List[int]],
+                     changed_only: bool,
+                     restore: bool = True) -> None:
+        """
+        Stream the rows of custom characters using the address auto increment
+
+        :param      charmaps:      The charmaps by location
+        :type       charmaps:      Dict[int, List[int]]
+        :param      changed_only:  Flag to skip rows matching the CGRAM
+        :type       changed_only:  bool
+        :param      restore:       Flag to restore a known DDRAM address
+        :type       restore:       bool
+        """
+        address = self._address
+        cgram = self._cgram
+        # CGRAM address of the next row written, no address is set yet
+        expected = -1
+
+        for location in sorted(charmaps):
+            charmap = charmaps[location]
+            location &= 0x7     # we only have 8, locations 0-7
+            base = location * 8
+            known = changed_only and self._cgram_valid & (1 << location)
+
+            for x in range(0, 8):
+                value = charmap[x] & 0x1F
+                if known and cgram[base + x] == value:
+                    continue
+                if base + x != expected:
+                    self._put(value=(Const.LCD_SETCGRAMADDR | (base + x)))
+                    # address counter points to CGRAM now
+                    self._address = -1
+                self._put(value=value, mode=Const.RS)
+                cgram[base + x] = value
+                expected = base + x + 1
+
+            self._cgram_valid |= 1 << location
+            self._use_glyph(location=location)
+
+        if restore and expected >= 0 and address >= 0:
+            self._put(value=(Const.LCD_SETDDRAMADDR | address))
+            self._address = address
+        self._flush()
+
+    def load_glyph(self, charmap: List[int]) -> int:
+        """
+        Get the character code of a custom character, uploading it if needed
+
+        Custom characters are identified by their charmap. If it is not
+        stored in one of the 8 CGRAM locations yet, it is stored in a free
+        one or replaces the least recently used custom character which is not
+        shown on the display or in the framebuffer. Print the returned code,
+        e.g. with chr(code).
+
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+
+        :returns:   Character code 0-7, -1 if all locations are shown
+        :rtype:     int
+        """
+        location = self._find_glyph(charmap=charmap)
+        if location >= 0:
+            self._use_glyph(location=location)
+            return location
+
+        location = self._free_glyph_location()
+        if location >= 0:
+            self._create_char(location=location, charmap=charmap)
+
+        return location
+
+    def _find_glyph(self, charmap: List[int]) -> int:
+        """
+        Find the CGRAM location storing a custom character
+
+        :param      charmap:   The charmap aka custom character
+        :type       charmap:   List[int]
+
+        :returns:   Location 0-7, -1 if not stored
+        :rtype:     int
+        """
+        cgram = self._cgram
+        for location in range(0, 8):
+            if not self._cgram_valid & (1 << location):
+                continue
+            base = location * 8
+            for x in range(0, 8):
+                if cgram[base + x] != charmap[x] & 0x1F:
+                    break
+            else:
+                return location
+
+        return -1
+
+    def _free_glyph_location(self) -> int:
+        """
+        Get a CGRAM location which can be overwritten
+
+        :returns:   Unused or least recently used location not shown, -1 if
+                    all locations are shown
+        :rtype:     int
+        """
+        for location in range(0, 8):
+            if not self._cgram_valid & (1 << location):
+                return location
+
+        shown = self._shown_glyphs()
+        found = -1
+        for location in range(0, 8):
+            if shown & (1 << location):
+                continue
+            if found < 0 or \
+                    self._cgram_used[location] < self._cgram_used[found]:
+                found = location
+
+        return found
+
+    def _shown_glyphs(self) -> int:
+        """
+        Get the custom characters shown on the display or in the framebuffer
+
+        If the display content is unknown, all custom characters are assumed
+        to be shown.
+
+        :returns:   Mask of the shown locations
+        :rtype:     int
+        """
+        if not (self._shadow_valid or self._cells_valid):
+            return 0xFF
+
+        shown = 0
+        for value in self._shadow:
+            # codes 8-15 show the custom characters 0-7 as well
+            if value < 16:
+                shown |= 1 << (value & 0x7)
+        if self._framebuffer is not None:
+            for value in self._framebuffer:
+                if value < 16:
+                    shown |= 1 << (value & 0x7)
+
+        return shown
+
+    def _use_glyph(self, location: int) -> None:
+        """
+        Mark a custom character as most recently used
+
+        :param      location:  The location of the custom character
+        :type       location:  int
+        """
+        self._glyph_clock += 1
+        self._cgram_used[location] = self._glyph_clock
+
+    def get_state(self) -> bytearray:
+        """
+        Get the modelled state of the driver and the display
+
+        The state contains the display function, control and mode, the
+        backlight, the cursor, the custom characters and the last sent display
+        content. It has a fixed size of Const.STATE_SIZE bytes and can e.g. be
+        kept in the RTC memory during deep sleep, @see set_state
+
+        :returns:   Serialized state
+        :rtype:     bytearray
+        """
+        state = bytearray(Const.STATE_SIZE)
+        state[0] = Const.STATE_MAGIC
+        state[1] = Const.STATE_VERSION
+        state[2] = self._cols
+        state[3] = self._rows
+        state[4] = self._display_function
+        state[5] = self._display_control
+        state[6] = self._display_mode
+        state[7] = self._backlightval
+        state[8] = self._cursor_col & 0xFF
+        state[9] = self._cursor_row
+        state[10] = self._shift & 0xFF
+        state[11] = self._configured | self._shadow_valid << 1 | \
+            self._cells_valid << 2
+        state[12] = self._cgram_valid
+        pos = Const.STATE_HEADER_SIZE
+        state[pos:pos + 64] = self._cgram
+        pos += 64
+        cells = min(len(self._shadow), Const.STATE_SIZE - pos)
+        state[pos:pos + cells] = self._shadow[:cells]
+
+        return state
+
+    def set_state(self, state: Union[bytes, bytearray]) -> bool:
+        """
+        Restore the state of the driver and the display
+
+        Nothing is sent to the display, call @see resume afterwards to adopt
+        the still powered display. As the last sent display content is
+        restored, only changed cells are sent by @see show or @see clear.
+        In framebuffer mode the framebuffer is set to the restored content.
+
+        :param      state:  The state returned by @see get_state
+        :type       state:  Union[bytes, bytearray]
+
+        :returns:   Flag whether the state is valid for this display
+        :rtype:     bool
+        """
+        if (len(state) != Const.STATE_SIZE or
+                state[0] != Const.STATE_MAGIC or
+                state[1] != Const.STATE_VERSION or
+                state[2] != self._cols or
+                state[3] != self._rows):
+            return False
+
+        self._display_function = state[4]
+        self._display_control = state[5]
+        self._display_mode = state[6]
+        if self._backlightval != state[7]:
+            self._backlightval = state[7]
+            self._build_lut()
+        self._cursor_col = state[8]
+        self._cursor_row = state[9]
+        self._shift = -1 if state[10] == 0xFF else state[10]
+        self._configured = bool(state[11] & 0x01)
+        self._shadow_valid = bool(state[11] & 0x02)
+        self._cells_valid = bool(state[11] & 0x04)
+        self._cgram_valid = state[12]
+        pos = Const.STATE_HEADER_SIZE
+        self._cgram[:] = state[pos:pos + 64]
+        pos += 64
+        cells = min(len(self._shadow), Const.STATE_SIZE - pos)
+        self._shadow[:cells] = state[pos:pos + cells]
+        if cells < len(self._shadow):
+            self._shadow_valid = False
+            self._cells_valid = False
+        self._address = -1
+
+        if self._framebuffer is not None:
+            self._framebuffer[:] = self._shadow
+
+        return True
 
     def print(self, text: str) -> None:
         """
         Print text on LCD
 
+        The text is encoded into the preallocated frame buffer and sent with
+        one I2C transaction per row of columns. In framebuffer mode the text
+        is written into the framebuffer instead, text beyond the last column
+        is cut off.
+
         :param      test: Text to show on the LCD
         :type       text: str
         """
-        _cursor_x, _cursor_y = self.cursor_position
+        if self._framebuffer is not None:
+            self._print_framebuffer(text=text)
+            return
+
+        # keep the shadow up to date for text within a row
+        shadow = None
+        pos = self._cell_index(address=self._address)
+        if ((self._shadow_valid or self._cells_valid) and pos >= 0 and
+                self._display_mode & Const.LCD_ENTRYLEFT and
+                pos % self._cols + len(text) <= self._cols):
+            shadow = self._shadow
+        else:
+            self._shadow_valid = False
+            self._cells_valid = False
 
         for char in text:
-            self._command(value=ord(char), mode=Const.RS)
+            value = ord(char)
+            self._put(value=value, mode=Const.RS)
+            if shadow is not None:
+                shadow[pos] = value & 0xFF
+                pos += 1
+        self._flush()
+        self._advance_address(count=len(text))
+
+        # with autoscroll the display shifts on every written character
+        if self._display_mode & Const.LCD_ENTRYSHIFTINCREMENT:
+            if self._display_mode & Const.LCD_ENTRYLEFT:
+                self._shift_display(count=len(text))
+            else:
+                self._shift_display(count=-len(text))
+
+        self._set_cursor(col=self._cursor_col + len(text),
+                         row=self._cursor_row)
+
+    def show(self) -> None:
+        """
+        Send the changed cells of the framebuffer to the LCD
+
+        Only runs of cells differing from the last sent state are written. The
+        DDRAM address is only set where a run does not continue at the address
+        auto incremented by the controller. With right to left text flow or
+        autoscroll the entry mode is switched to left to right while sending.
+        A single unchanged cell between two runs is sent along, as it costs as
+        much as setting the address.
+        """
+        if self._framebuffer is None:
+            return
 
-        self.cursor_position = (_cursor_x + len(text), _cursor_y)
+        self._render(target=self._framebuffer)
 
-    def _command(self, value: int, mode: int = 0) -> None:
+        # move a visible cursor to its position in the framebuffer
+        if self._display_control & (Const.LCD_CURSORON | Const.LCD_BLINKON):
+            offset = Const.ROW_OFFSETS[self._cursor_row]
+            self._set_address(address=(offset + self._cursor_col))
+
+    def _render(self, target: bytearray) -> None:
+        """
+        Send the cells of a target differing from the shadow
+
+        If the display content is unknown, e.g. after @see resume, all cells
+        are sent.
+
+        :param      target:  The target content, one byte per cell
+        :type       target:  bytearray
+        """
+        shadow = self._shadow
+        cols = self._cols
+        full = not (self._shadow_valid or self._cells_valid)
+        # entry mode to restore if the runs need a different one
+        mode = self._display_mode
+        plain = mode & (Const.LCD_ENTRYLEFT | Const.LCD_ENTRYSHIFTINCREMENT) \
+            == Const.LCD_ENTRYLEFT
+        switched = False
+
+        for row in range(0, self._rows):
+            base = row * cols
+            offset = Const.ROW_OFFSETS[row]
+            col = 0
+            while col < cols:
+                if not full and target[base + col] == shadow[base + col]:
+                    col += 1
+                    continue
+
+                if full:
+                    end = cols
+                else:
+                    end = self._run_end(target=target, base=base, col=col)
+                if not plain and not switched:
+                    self._display_mode = Const.LCD_ENTRYLEFT
+                    self._put(value=(Const.LCD_ENTRYMODESET |
+                                     self._display_mode))
+                    switched = True
+                if offset + col != self._address:
+                    self._put(value=(Const.LCD_SETDDRAMADDR | (offset + col)))
+                    self._address = offset + col
+                self._advance_address(count=end - col)
+                while col < end:
+                    shadow[base + col] = target[base + col]
+                    self._put(value=target[base + col], mode=Const.RS)
+                    col += 1
+        if switched:
+            self._display_mode = mode
+            self._put(value=(Const.LCD_ENTRYMODESET | mode))
+        self._flush()
+        self._cells_valid = True
+
+    def _count_frames(self, target: bytearray) -> int:
+        """
+        Count the frames @see _render would send for a target
+
+        :param      target:  The target content, one byte per cell
+        :type       target:  bytearray
+
+        :returns:   Number of frames
+        :rtype:     int
+        """
+        shadow = self._shadow
+        cols = self._cols
+        address = self._address
+        frames = 0
+
+        for row in range(0, self._rows):
+            base = row * cols
+            offset = Const.ROW_OFFSETS[row]
+            col = 0
+            while col < cols:
+                if target[base + col] == shadow[base + col]:
+                    col += 1
+                    continue
+
+                end = self._run_end(target=target, base=base, col=col)
+                if offset + col != address:
+                    frames += 1
+                frames += end - col
+                address = offset + end
+                col = end
+
+        return frames
+
+    def _run_end(self, target: bytearray, base: int, col: int) -> int:
+        """
+        Get the end of a run of cells differing from the shadow
+
+        A single unchanged cell between two runs is part of the run, as it
+        costs as much as setting the address.
+
+        :param      target:  The target content, one byte per cell
+        :type       target:  bytearray
+        :param      base:    The index of the first cell of the row
+        :type       base:    int
+        :param      col:     The first column of the run
+        :type       col:     int
+
+        :returns:   Column after the last cell of the run
+        :rtype:     int
+        """
+        shadow = self._shadow
+        cols = self._cols
+        end = col + 1
+        while end < cols and (
+            target[base + end] != shadow[base + end] or
+            (end + 1 < cols and
+             target[base + end + 1] != shadow[base + end + 1])
+        ):
+            end += 1
+
+        return end
+
+    def _cell_index(self, address: int) -> int:
+        """
+        Get the index of the shown cell of a DDRAM address
+
+        :param      address:  The DDRAM address
+        :type       address:  int
+
+        :returns:   Index of the cell, -1 if the address is not shown
+        :rtype:     int
+        """
+        if address >= 0:
+            for row in range(0, self._rows):
+                col = address - Const.ROW_OFFSETS[row]
+                if 0 <= col < self._cols:
+                    return row * self._cols + col
+
+        return -1
+
+    def _set_address(self, address: int) -> None:
+        """
+        Set the DDRAM address unless the address counter is already there
+
+        :param      address:  The DDRAM address
+        :type       address:  int
+        """
+        if address != self._address:
+            self._command(value=(Const.LCD_SETDDRAMADDR | address))
+            self._address = address
+
+    def _advance_address(self, count: int) -> None:
+        """
+        Model the address counter after writing data to DDRAM
+
+        The address counter is incremented or decremented according to the
+        text flow. In 2 line mode the address wraps from 0x27 to 0x40 and from
+        0x67 to 0x00, in 1 line mode from 0x4F to 0x00.
+
+        :param      count:  The number of written characters
+        :type       count:  int
+        """
+        address = self._address
+        if address < 0:
+            return
+
+        two_line = self._display_function & Const.LCD_2LINE
+        if two_line:
+            # linear position over both lines of 40 characters each
+            address = (address & 0x3F) + (40 if address & 0x40 else 0)
+
+        if self._display_mode & Const.LCD_ENTRYLEFT:
+            address = (address + count) % 80
+        else:
+            address = (address - count) % 80
+
+        if two_line and address >= 40:
+            address = address - 40 + 0x40
+        self._address = address
+
+    def _print_framebuffer(self, text: str) -> None:
+        """
+        Print text into the framebuffer
+
+        :param      text:  Text to write into the framebuffer
+        :type       text:  str
+        """
+        fb = self._framebuffer
+        col = self._cursor_col
+        pos = self._cursor_row * self._cols + col
+        for char in text:
+            if col < self._cols:
+                fb[pos] = ord(char) & 0xFF
+            pos += 1
+            col += 1
+        self._cursor_col = col
+
+    def _command(self,
+                 value: int,
+                 mode: int = 0,
+                 exec_us: int = Const.EXEC_TIME_US) -> None:
         """
         Send 8 bits command to I2C device
 
-        :param      value:  The value
+        Both nibbles including their Enable (EN) strobes are encoded into one
+        frame and sent in a single I2C transaction. The time to transfer a
+        byte on the bus already satisfies the EN pulse width of >450ns.
+
+        :param      value:    The value
+        :type       value:    int
+        :param      mode:     The mode, e.g. Const.RS for data
+        :type       mode:     int
+        :param      exec_us:  The execution time of the command in us
+        :type       exec_us:  int
+        """
+        self._put(value=value, mode=mode)
+        self._flush(exec_us=exec_us)
+
+    def _put(self, value: int, mode: int = 0) -> None:
+        """
+        Encode a byte as port expander frame into the frame buffer
+
+        The frame is copied from the lookup table built by @see _build_lut,
+        if vectored only a reference to its entry is kept. A full frame buffer
+        is sent before, so the last frame is always kept pending for
+        @see _flush with its execution time.
+
+        :param      value:  The value to encode
+        :type       value:  int
+        :param      mode:   The mode, e.g. Const.RS for data
+        :type       mode:   int
+        """
+        if self._pending == self._frames_per_write:
+            self._flush(force=True)
+
+        idx = (mode << 8) | (value & 0xFF)
+        if self._vectored:
+            self._slots[self._pending] = self._lut_frames[idx]
+        else:
+            # indexing copies without creating a slice
+            buf = self._buf
+            lut = self._lut
+            pos = self._pending * Const.FRAME_SIZE
+            idx *= Const.FRAME_SIZE
+            buf[pos] = lut[idx]
+            buf[pos + 1] = lut[idx + 1]
+            buf[pos + 2] = lut[idx + 2]
+            buf[pos + 3] = lut[idx + 3]
+            buf[pos + 4] = lut[idx + 4]
+            buf[pos + 5] = lut[idx + 5]
+        self._pending += 1
+
+    def _flush(self,
+               exec_us: int = Const.EXEC_TIME_US,
+               force: bool = False) -> None:
+        """
+        Send all pending frames of the frame buffer
+
+        Inside a @see batch frames are only sent before a long instruction is
+        executed or if forced.
+
+        :param      exec_us:  The execution time of the last frame in us
+        :type       exec_us:  int
+        :param      force:    Flag to send the frames inside a batch
+        :type       force:    bool
+        """
+        if (self._batch_depth and not force and
+                exec_us <= Const.EXEC_TIME_US):
+            return
+
+        if self._pending:
+            if self._vectored:
+                vector = self._vectors[self._pending]
+                for num in range(0, self._pending):
+                    vector[num] = self._slots[num]
+                self._send(frame=vector, exec_us=exec_us)
+            else:
+                self._send(frame=self._frames[self._pending], exec_us=exec_us)
+            self._pending = 0
+
+    def _send(self,
+              frame: Union[memoryview, List[memoryview]],
+              exec_us: int = Const.EXEC_TIME_US) -> None:
+        """
+        Send encoded frames to the I2C device once the controller is ready
+
+        :param      frame:    The encoded frames, a vector of frames if
+                              vectored
+        :type       frame:    Union[memoryview, List[memoryview]]
+        :param      exec_us:  The execution time of the last frame in us
+        :type       exec_us:  int
+        """
+        self._wait_ready()
+        self._acquire_bus()
+        try:
+            if isinstance(frame, list):
+                self._i2c.writevto(self._addr, frame)
+            else:
+                self._i2c.writeto(self._addr, frame)
+        finally:
+            self._release_bus()
+        self._busy_until = ticks_add(ticks_us(), exec_us)
+
+        if self._yield_hook is not None:
+            self._yield_hook()
+
+    def _acquire_bus(self) -> None:
+        """Acquire the bus lock if given"""
+        if self._bus_lock is not None:
+            self._bus_lock.acquire()
+
+    def _release_bus(self) -> None:
+        """Release the bus lock if given"""
+        if self._bus_lock is not None:
+            self._bus_lock.release()
+
+    def _wait_ready(self) -> None:
+        """
+        Wait until the controller is able to latch the next frame
+
+        Only the time remaining until the busy deadline is waited, reduced by
+        the time the bus needs to transfer the next frame up to its latch.
+        """
+        remaining = ticks_diff(self._busy_until, ticks_us()) - \
+            self._latch_time_us
+        if remaining > 0:
+            # polling only pays off if it takes less time than waiting
+            if self._busy_flag and remaining > self._poll_time_us:
+                self._poll_busy_flag()
+            else:
+                sleep_us(remaining)
+
+    def _poll_busy_flag(self) -> None:
+        """
+        Poll the busy flag until the controller is ready
+
+        Polling is disabled if the busy flag is still set after the timeout,
+        as the R/W pin is not connected in this case, @see _disable_busy_flag
+        """
+        start = ticks_us()
+        while self._read_busy_address() & Const.LCD_BUSYFLAG:
+            if ticks_diff(ticks_us(), start) > Const.BUSY_TIMEOUT_US:
+                self._disable_busy_flag()
+                # the pending frames are written at the unknown address
+                self._shadow_valid = False
+                self._cells_valid = False
+                break
+
+    def _probe_busy_flag(self) -> bool:
+        """
+        Check the busy flag and address counter can be read
+
+        The address counter has to be zero, e.g. after @see home. With the R/W
+        pin tied low the read data is the written all high data instead.
+
+        :returns:   Flag whether the busy flag can be read
+        :rtype:     bool
+        """
+        self._busy_flag = False
+        self._wait_ready()
+
+        if self._read_busy_address() == 0x00:
+            return True
+
+        self._disable_busy_flag()
+        return False
+
+    def _disable_busy_flag(self) -> None:
+        """
+        Fall back to timed waits as the busy flag cannot be read
+
+        With the R/W pin tied low the read strobes are latched as instruction
+        0xFF, which sets the DDRAM address to 0x7F. The address counter is
+        unknown afterwards.
+        """
+        self._busy_flag = False
+        self._address = -1
+        self._busy_until = ticks_add(ticks_us(), Const.EXEC_TIME_US)
+
+    def _read_busy_address(self) -> int:
+        """
+        Read the busy flag and address counter
+
+        Data pins are set high to act as inputs of the port expander, R/W is
+        set high and both nibbles are read while Enable (EN) is high.
+
+        :returns:   Busy flag (bit 7) and address counter (bits 0-6)
+        :rtype:     int
+        """
+        idle = 0xF0 | Const.RW | self._backlightval
+        strobe = self._strobe_buf
+        strobe[0] = idle
+        strobe[1] = idle | Const.EN
+
+        self._acquire_bus()
+        try:
+            self._i2c.writeto(self._addr, strobe)
+            self._i2c.readfrom_into(self._addr, self._read_buf)
+            value = self._read_buf[0] & 0xF0
+
+            self._i2c.writeto(self._addr, strobe)
+            self._i2c.readfrom_into(self._addr, self._read_buf)
+            value |= self._read_buf[0] >> 4
+
+            self._byte_buf[0] = idle
+            self._i2c.writeto(self._addr, self._byte_buf)
+        finally:
+            self._release_bus()
+
+        return value
+
+    def _fill(self, buf: bytearray, value: int = 0x20) -> None:
+        """
+        Fill a buffer without allocating memory
+
+        :param      buf:    The buffer to fill
+        :type       buf:    bytearray
+        :param      value:  The value to fill with, a space by default
         :type       value:  int
         """
-        high_nib = value & 0xF0
-        low_nib = (value << 4) & 0xF0
-        self._write_4_bits(value=(high_nib | mode))
-        self._write_4_bits(value=(low_nib | mode))
+        for idx in range(0, len(buf)):
+            buf[idx] = value
+
+    def _build_lut(self) -> None:
+        """
+        Build the frame lookup table for the current backlight value
+
+        Maps every byte 0-255 for instructions and for data (RS set) to its
+        port expander frame. Each nibble is encoded as data, data with EN high
+        and data with EN low.
+        """
+        lut = self._lut
+        pos = 0
+        for mode in (0, Const.RS):
+            for value in range(0, 256):
+                data = (value & 0xF0) | mode | self._backlightval
+                lut[pos] = data
+                lut[pos + 1] = data | Const.EN
+                lut[pos + 2] = data
+                data = ((value << 4) & 0xF0) | mode | self._backlightval
+                lut[pos + 3] = data
+                lut[pos + 4] = data | Const.EN
+                lut[pos + 5] = data
+                pos += Const.FRAME_SIZE
+
+    def _write_nibble(self,
+                      value: int,
+                      exec_us: int = Const.EXEC_TIME_US) -> None:
+        """
+        Write a single nibble of an instruction in one I2C transaction
+
+        :param      value:    The nibble to send, 0x0 to 0xF
+        :type       value:    int
+        :param      exec_us:  The execution time of the nibble in us
+        :type       exec_us:  int
+        """
+        # frames collected by a batch are sent first to keep the order
+        self._flush(force=True)
+        # first half of the frame of a byte with this nibble as high nibble
+        idx = (value << 4) * Const.FRAME_SIZE
+        buf = self._buf
+        lut = self._lut
+        buf[0] = lut[idx]
+        buf[1] = lut[idx + 1]
+        buf[2] = lut[idx + 2]
+        self._send(frame=self._half_frame, exec_us=exec_us)
 
     def _write_4_bits(self, value: int) -> None:
         """
@@ -436,13 +1807,15 @@ class LCD:
         :param      value:  The value to send
         :type       value:  int
         """
-        # Set Enable (EN) pin HIGH, pulse must be >450ns
+        self._wait_ready()
+
+        # Set Enable (EN) pin HIGH, pulse must be >450ns, which is less than
+        # the time to transfer one byte on the bus
         self._expander_write(value=(value | Const.EN))
-        sleep_us(1)
 
         # Set Enable (EN) pin LOW, needs >37us to settle
         self._expander_write(value=(value & ~Const.EN))
-        sleep_us(50)
+        self._busy_until = ticks_add(ticks_us(), Const.EXEC_TIME_US)
 
     def _expander_write(self, value: int) -> None:
         """
@@ -451,4 +1824,9 @@ class LCD:
         :param      value:  The value to send
         :type       value:  int
         """
-        self._i2c.writeto(self.addr, bytes([value | self._backlightval]))
+        self._byte_buf[0] = value | self._backlightval
+        self._acquire_bus()
+        try:
+            self._i2c.writeto(self._addr, self._byte_buf)
+        finally:
+            self._release_bus()
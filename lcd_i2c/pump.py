@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Non-blocking I2C LCD Display driver for 1602 and 2004 displays
+
+Once started, the encoded frames are only queued into a ring buffer and sent
+a few at a time by @see PumpLCD.pump, e.g. called by a timer, so the LCD
+methods return without waiting for the bus or the controller.
+"""
+
+# system packages
+from time import ticks_add, ticks_diff, ticks_us
+
+# custom packages
+from . import const as Const
+from .lcd_i2c import LCD
+from .timer import ScheduledTimer
+
+
+class PumpLCD(LCD):
+    """
+    Driver queueing the frames for the Liquid Crystal LCD displays
+
+    The single nibbles of @see begin and @see resume are not queued, they
+    are sent after all queued frames. Polling the busy flag is disabled once
+    started, the queued execution times of the instructions are waited
+    instead.
+
+    The ring buffer holds the port expander frames, each followed by a delay
+    marker if the instruction takes longer than Const.EXEC_TIME_US. A marker
+    is the Const.RW bit, which is never set by a frame, and the execution
+    time in units of Const.PUMP_DELAY_UNIT_US.
+    """
+
+    def __init__(self,
+                 *args,
+                 queue_size: int = 512,
+                 policy: int = Const.PUMP_BLOCK,
+                 frames_per_tick: int = 4,
+                 **kwargs) -> None:
+        """
+        Constructs a new instance, @see lcd_i2c.LCD for further arguments
+
+        :param      queue_size:       The size of the ring buffer in bytes
+        :type       queue_size:       int
+        :param      policy:           The overflow policy, Const.PUMP_BLOCK,
+                                      Const.PUMP_DROP_OLDEST or
+                                      Const.PUMP_COALESCE
+        :type       policy:           int
+        :param      frames_per_tick:  The maximum number of frames per pump,
+                                      limited by @see max_transfer and
+                                      @see max_hold_us as well
+        :type       frames_per_tick:  int
+        """
+        # the ring buffer needs the frames as one buffer
+        kwargs['vectored'] = False
+        super().__init__(*args, **kwargs)
+
+        # a full frame buffer and a marker fit at least, one byte is kept
+        # free to distinguish a full from an empty ring buffer
+        self._ring = bytearray(max(queue_size, len(self._buf) + 3))
+        self._head: int = 0
+        self._tail: int = 0
+        self._marker = bytearray([Const.RW, 0])
+        self._policy: int = policy
+
+        # the transaction size may be limited further later on
+        frames = max(min(frames_per_tick, self._max_frames_per_write), 1)
+        self._out = bytearray(frames * Const.FRAME_SIZE)
+        _mv = memoryview(self._out)
+        self._out_frames = [
+            _mv[:num * Const.FRAME_SIZE] for num in range(0, frames + 1)
+        ]
+
+        self._pumping: bool = False
+        # the ring buffer is modified, a scheduled pump has to skip
+        self._ring_busy: bool = False
+        self._show_pending: bool = False
+        self._dropped: int = 0
+        self._timer = ScheduledTimer(func=self.pump)
+
+    @property
+    def queued(self) -> int:
+        """
+        Get the number of queued bytes incl. delay markers
+
+        :returns:   Number of bytes in the ring buffer
+        :rtype:     int
+        """
+        return (self._head - self._tail) % len(self._ring)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Get the number of frames dropped by Const.PUMP_DROP_OLDEST
+
+        :returns:   Number of dropped frames and delay markers
+        :rtype:     int
+        """
+        return self._dropped
+
+    def start(self, timer=None, period_ms: int = 1) -> None:
+        """
+        Start queueing the frames instead of sending them
+
+        Without a timer @see pump has to be called regularly, e.g. by the
+        main loop.
+
+        :param      timer:      The optional timer, e.g. machine.Timer(0)
+        :type       timer:      machine.Timer
+        :param      period_ms:  The period of the timer in milliseconds
+        :type       period_ms:  int
+        """
+        self._busy_flag = False
+        self._pumping = True
+        if timer is not None:
+            self._timer.start(timer=timer, period_ms=period_ms)
+
+    def stop(self) -> None:
+        """Send all queued frames and stop queueing"""
+        self._timer.stop()
+        self.flush()
+        self._pumping = False
+
+    def pump(self) -> None:
+        """
+        Send the next queued frames if the controller is ready
+
+        At most frames_per_tick frames are sent in one I2C transaction.
+        """
+        if (self._ring_busy or self._head == self._tail or
+                ticks_diff(self._busy_until, ticks_us()) > 0):
+            return
+
+        self._drain()
+
+    def flush(self) -> None:
+        """Wait until all queued frames have been sent"""
+        while True:
+            if self._head == self._tail:
+                if not self._show_pending:
+                    break
+                self._show_pending = False
+                LCD.show(self)
+                continue
+
+            self._wait_ready()
+            self._drain()
+
+    def show(self) -> None:
+        """
+        Send the changed cells of the framebuffer to the LCD
+
+        With Const.PUMP_COALESCE the framebuffer is not shown while frames
+        are queued, all changes until the ring buffer is empty are sent by
+        the next call of @see show or @see flush
+
+        @see lcd_i2c.LCD.show
+        """
+        if (self._pumping and self._policy == Const.PUMP_COALESCE and
+                self._head != self._tail):
+            self._show_pending = True
+            return
+
+        self._show_pending = False
+        LCD.show(self)
+
+    def _send(self,
+              frame: memoryview,
+              exec_us: int = Const.EXEC_TIME_US) -> None:
+        """
+        Queue encoded frames into the ring buffer once started
+
+        :param      frame:    The encoded frames
+        :type       frame:    memoryview
+        :param      exec_us:  The execution time of the last frame in us
+        :type       exec_us:  int
+        """
+        if not self._pumping:
+            super()._send(frame=frame, exec_us=exec_us)
+            return
+
+        if len(frame) % Const.FRAME_SIZE:
+            # single nibbles would break the alignment of the ring buffer
+            self.flush()
+            super()._send(frame=frame, exec_us=exec_us)
+            return
+
+        self._ring_busy = True
+        size = len(frame)
+        if exec_us > Const.EXEC_TIME_US:
+            self._marker[1] = min(-(-exec_us // Const.PUMP_DELAY_UNIT_US),
+                                  0xFF)
+            size += 2
+
+        if self._free() < size:
+            self._overflow(size=size)
+
+        self._write_ring(data=frame)
+        if size > len(frame):
+            self._write_ring(data=self._marker)
+        self._ring_busy = False
+
+    def _expander_write(self, value: int) -> None:
+        """
+        Write data to I2C device (port expander) after all queued frames
+
+        The queued frames are encoded with the previous backlight bit, so
+        they are sent before e.g. the backlight is changed.
+
+        :param      value:  The value to send
+        :type       value:  int
+        """
+        if self._pumping:
+            self.flush()
+        super()._expander_write(value=value)
+
+    def _free(self) -> int:
+        """
+        Get the free space of the ring buffer
+
+        :returns:   Number of bytes which can be queued
+        :rtype:     int
+        """
+        return (self._tail - self._head - 1) % len(self._ring)
+
+    def _write_ring(self, data: memoryview) -> None:
+        """
+        Copy data into the ring buffer
+
+        :param      data:  The data
+        :type       data:  memoryview
+        """
+        ring = self._ring
+        head = self._head
+        num = len(data)
+        first = min(num, len(ring) - head)
+        ring[head:head + first] = data[:first]
+        if first < num:
+            ring[0:num - first] = data[first:]
+        self._head = (head + num) % len(ring)
+
+    def _overflow(self, size: int) -> None:
+        """
+        Make space in the ring buffer according to the overflow policy
+
+        :param      size:  The number of bytes to be queued
+        :type       size:  int
+        """
+        ring = self._ring
+
+        if self._policy == Const.PUMP_DROP_OLDEST:
+            while self._free() < size:
+                tail = self._tail
+                if ring[tail] & Const.RW:
+                    self._tail = (tail + 2) % len(ring)
+                else:
+                    self._tail = (tail + Const.FRAME_SIZE) % len(ring)
+                self._dropped += 1
+            # the address and content of the display are unknown
+            self._address = -1
+            self._shadow_valid = False
+            self._cells_valid = False
+        else:
+            while self._free() < size:
+                self._wait_ready()
+                self._drain()
+
+    def _drain(self) -> None:
+        """
+        Send the next queued frames up to the next delay marker
+
+        A pump scheduled meanwhile skips, otherwise it would send the same
+        frames again.
+        """
+        busy = self._ring_busy
+        self._ring_busy = True
+        try:
+            self._drain_frames()
+        finally:
+            self._ring_busy = busy
+
+    def _drain_frames(self) -> None:
+        """Send the next queued frames, @see _drain"""
+        ring = self._ring
+        size = len(ring)
+        out = self._out
+        head = self._head
+        tail = self._tail
+        num = 0
+        limit = min(len(out), self._frames_per_write * Const.FRAME_SIZE)
+
+        while (tail != head and num < limit and
+               not ring[tail] & Const.RW):
+            for idx in range(0, Const.FRAME_SIZE):
+                out[num + idx] = ring[(tail + idx) % size]
+            num += Const.FRAME_SIZE
+            tail = (tail + Const.FRAME_SIZE) % size
+
+        if num:
+            self._acquire_bus()
+            try:
+                self._i2c.writeto(self._addr,
+                                  self._out_frames[num // Const.FRAME_SIZE])
+            finally:
+                self._release_bus()
+
+        exec_us = Const.EXEC_TIME_US
+        if tail != head and ring[tail] & Const.RW:
+            exec_us = ring[(tail + 1) % size] * Const.PUMP_DELAY_UNIT_US
+            tail = (tail + 2) % size
+
+        self._busy_until = ticks_add(ticks_us(), exec_us)
+        self._tail = tail
+
+        if num and self._yield_hook is not None:
+            self._yield_hook()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Refresh scheduler sending the framebuffer of a LCD with a frame rate cap
+
+Producers print into the framebuffer at any rate, all writes to the same cells
+between two refreshes are coalesced as only the cells differing from the last
+sent state are written by @see lcd_i2c.LCD.show
+"""
+
+# system packages
+from time import ticks_diff, ticks_ms
+
+# custom packages
+from .lcd_i2c import LCD
+from .timer import ScheduledTimer
+
+
+class RefreshScheduler:
+    """Send the framebuffer of a LCD at most a number of times per second"""
+
+    def __init__(self, lcd: LCD, fps: int = 10) -> None:
+        """
+        Constructs a new instance.
+
+        :param      lcd:  The LCD in framebuffer mode, also an AsyncLCD
+        :type       lcd:  LCD
+        :param      fps:  The maximum number of refreshes per second
+        :type       fps:  int
+
+        :raises     ValueError:  The LCD is not in framebuffer mode or the
+                                 frame rate is not positive
+        """
+        if lcd.framebuffer is None:
+            raise ValueError("LCD is not in framebuffer mode")
+        if fps <= 0:
+            raise ValueError("Frame rate has to be positive")
+
+        self._lcd = lcd
+        self._period_ms: int = max(1000 // fps, 1)
+        self._running: bool = False
+        self._timer = ScheduledTimer(func=self._scheduled_refresh)
+
+    @property
+    def period_ms(self) -> int:
+        """
+        Get the minimum time between two refreshes
+
+        :returns:   Refresh period in milliseconds
+        :rtype:     int
+        """
+        return self._period_ms
+
+    @property
+    def running(self) -> bool:
+        """
+        Get the status of the refresh task or timer
+
+        :returns:   Flag whether refreshes are scheduled
+        :rtype:     bool
+        """
+        return self._running
+
+    def refresh(self) -> None:
+        """Send the changed cells of the framebuffer of a synchronous LCD"""
+        self._lcd.show()
+
+    async def run(self) -> None:
+        """
+        Refresh the LCD until @see stop is called
+
+        Run this coroutine as asyncio task. Each refresh is followed by a wait
+        for the remaining time of the refresh period.
+        """
+        # asyncio is only imported if it is used, a timer works without it
+        from .async_lcd import AsyncLCD, sleep_ms
+
+        self._running = True
+        while self._running:
+            start = ticks_ms()
+            if isinstance(self._lcd, AsyncLCD):
+                await self._lcd.show()
+            else:
+                self._lcd.show()
+
+            remaining = self._period_ms - ticks_diff(ticks_ms(), start)
+            await sleep_ms(max(remaining, 0))
+
+    def start_timer(self, timer) -> None:
+        """
+        Refresh a synchronous LCD by a periodic hardware or virtual timer
+
+        The refresh is not done in the interrupt context of the timer, but
+        scheduled to run as soon as possible by the MicroPython VM.
+
+        :param      timer:  The timer, e.g. machine.Timer(0)
+        :type       timer:  machine.Timer
+        """
+        self._running = True
+        self._timer.start(timer=timer, period_ms=self._period_ms)
+
+    def stop(self) -> None:
+        """Stop the refresh task or timer"""
+        self._running = False
+        self._timer.stop()
+
+    def _scheduled_refresh(self) -> None:
+        """Refresh scheduled by the timer, unless stopped meanwhile"""
+        if self._running:
+            self.refresh()
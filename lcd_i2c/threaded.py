@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Threaded I2C LCD Display driver for 1602 and 2004 displays controlled via I2C
+
+A render worker thread, e.g. on the second core of a RP2040, owns the I2C bus
+and does all the encoding and bus writes of the framebuffer shown by the main
+thread.
+"""
+
+# system packages
+from _thread import allocate_lock, start_new_thread
+from time import sleep_ms
+
+# custom packages
+from . import const as Const
+from .lcd_i2c import LCD
+
+
+class ThreadedLCD(LCD):
+    """
+    Driver rendering the framebuffer of a LCD in a worker thread
+
+    The LCD is always in framebuffer mode. While the worker runs, the main
+    thread shall only use @see print, @see set_cursor, @see clear,
+    @see home and @see show, which do not access the bus. Call @see stop
+    before using any other method.
+
+    @see show copies the framebuffer into the back buffer, the worker swaps
+    it with its render buffer. Both is done holding a lock, rendering and
+    sending is done without.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Constructs a new instance, @see lcd_i2c.LCD for the arguments
+        """
+        kwargs['framebuffer'] = True
+        super().__init__(*args, **kwargs)
+
+        self._back = bytearray(len(self._framebuffer))
+        self._target = bytearray(len(self._framebuffer))
+        self._back_cursor = [0, 0]
+
+        # protects the back buffer, its cursor and the flags
+        self._lock = allocate_lock()
+        # released to wake up the worker
+        self._signal = allocate_lock()
+        self._signal.acquire()
+        # held while the worker runs
+        self._done = allocate_lock()
+
+        self._running: bool = False
+        self._back_pending: bool = False
+        self._busy: bool = False
+
+    @property
+    def running(self) -> bool:
+        """
+        Get the status of the render worker
+
+        :returns:   Flag whether the worker thread runs
+        :rtype:     bool
+        """
+        return self._running
+
+    def start(self) -> None:
+        """
+        Start the render worker thread
+
+        Call @see begin or @see resume before, they are not done by the
+        worker.
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._done.acquire()
+        start_new_thread(self._run, ())
+
+    def stop(self) -> None:
+        """Send the last shown framebuffer and stop the render worker"""
+        if not self._running:
+            return
+
+        self.flush()
+        self._running = False
+        self._wake()
+        # wait until the worker returned
+        self._done.acquire()
+        self._done.release()
+
+    def show(self) -> None:
+        """
+        Hand the framebuffer over to the render worker
+
+        All framebuffers shown while the worker is busy are coalesced, only
+        the last one is rendered afterwards. Without a running worker the
+        framebuffer is shown directly, @see lcd_i2c.LCD.show
+        """
+        if not self._running:
+            LCD.show(self)
+            return
+
+        with self._lock:
+            self._back[:] = self._framebuffer
+            self._back_cursor[0] = self._cursor_col
+            self._back_cursor[1] = self._cursor_row
+            self._back_pending = True
+        self._wake()
+
+    def flush(self) -> None:
+        """Wait until the last shown framebuffer has been sent"""
+        while self._running:
+            # the worker takes a framebuffer and gets busy under the lock
+            with self._lock:
+                if not (self._back_pending or self._busy):
+                    break
+            sleep_ms(1)
+
+    def _wake(self) -> None:
+        """Wake up the render worker if it waits"""
+        # only the worker acquires the signal, it cannot change in between
+        if self._signal.locked():
+            self._signal.release()
+
+    def _run(self) -> None:
+        """Render the shown framebuffers until @see stop is called"""
+        try:
+            while True:
+                self._signal.acquire()
+                if not self._running:
+                    break
+
+                with self._lock:
+                    if not self._back_pending:
+                        continue
+                    self._back, self._target = self._target, self._back
+                    col = self._back_cursor[0]
+                    row = self._back_cursor[1]
+                    self._busy = True
+                    self._back_pending = False
+
+                self._render(target=self._target)
+
+                # move a visible cursor to its position in the framebuffer
+                if self._display_control & (Const.LCD_CURSORON |
+                                            Const.LCD_BLINKON):
+                    self._set_address(address=(Const.ROW_OFFSETS[row] + col))
+                self._busy = False
+        finally:
+            self._busy = False
+            self._done.release()
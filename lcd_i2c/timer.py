@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Periodic timer running a function outside of the interrupt context
+
+The timer callback only schedules the function, which is run as soon as
+possible by the MicroPython VM. It may use the bus, allocate memory or raise
+exceptions like any other code.
+"""
+
+# system packages
+from micropython import schedule
+
+# typing not natively supported on MicroPython
+from .typing import Callable
+
+
+class ScheduledTimer:
+    """Run a function periodically by a hardware or virtual timer"""
+
+    def __init__(self, func: Callable[[], None]) -> None:
+        """
+        Constructs a new instance.
+
+        :param      func:  The function to run each period
+        :type       func:  Callable[[], None]
+        """
+        self._func = func
+        self._timer = None
+        # bound methods allocate, so the scheduled callback is prepared
+        self._scheduled_cb = self._scheduled
+
+    @property
+    def running(self) -> bool:
+        """
+        Get the status of the timer
+
+        :returns:   Flag whether the timer has been started
+        :rtype:     bool
+        """
+        return self._timer is not None
+
+    def start(self, timer, period_ms: int) -> None:
+        """
+        Start the timer
+
+        :param      timer:      The timer, e.g. machine.Timer(0)
+        :type       timer:      machine.Timer
+        :param      period_ms:  The period in milliseconds
+        :type       period_ms:  int
+        """
+        self._timer = timer
+        timer.init(mode=timer.PERIODIC,
+                   period=period_ms,
+                   callback=self._callback)
+
+    def stop(self) -> None:
+        """Stop the timer, a scheduled function may still run once"""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    def _callback(self, timer) -> None:
+        """
+        Schedule the function from the interrupt context of the timer
+
+        :param      timer:  The timer
+        :type       timer:  machine.Timer
+        """
+        try:
+            schedule(self._scheduled_cb, None)
+        except RuntimeError:
+            # schedule queue is full, skip this period
+            pass
+
+    def _scheduled(self, _) -> None:
+        """Function call scheduled by @see _callback"""
+        self._func()
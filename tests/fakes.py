@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Fake MicroPython modules and helpers shared by the unittests
+
+Importing this module registers the fakes of the MicroPython specific
+modules and functions, so it has to be imported before the lcd_i2c package.
+"""
+
+from types import ModuleType
+from unittest.mock import Mock
+import asyncio
+import sys
+import time
+
+
+class Pin(object):
+    """Fake MicroPython Pin class"""
+    def __init__(self, pin: int, mode: int = -1):
+        self._pin = pin
+        self._mode = mode
+        self._value = 0
+
+
+class I2C(object):
+    """Fake MicroPython I2C class"""
+    def __init__(self, id: int, *, scl: Pin, sda: Pin, freq: int = 400000):
+        self._id = id
+        self._scl = scl
+        self._sda = sda
+        self._freq = freq
+
+    def writeto(addr: int, buf: bytearray, stop: bool = True) -> int:
+        return 1
+
+    def readfrom_into(addr: int, buf: bytearray, stop: bool = True) -> None:
+        pass
+
+
+def ticks_us() -> int:
+    """Fake MicroPython ticks_us function"""
+    return time.perf_counter_ns() // 1000
+
+
+def ticks_ms() -> int:
+    """Fake MicroPython ticks_ms function"""
+    return time.perf_counter_ns() // 1000000
+
+
+def ticks_add(ticks: int, delta: int) -> int:
+    """Fake MicroPython ticks_add function"""
+    return ticks + delta
+
+
+def ticks_diff(ticks1: int, ticks2: int) -> int:
+    """Fake MicroPython ticks_diff function"""
+    return ticks1 - ticks2
+
+
+async def sleep_ms(t: int) -> None:
+    """Fake MicroPython asyncio sleep_ms function"""
+    await asyncio.sleep(t / 1000)
+
+
+def const(value: int) -> int:
+    """Fake MicroPython const function"""
+    return value
+
+
+def schedule(func, arg) -> None:
+    """Fake MicroPython schedule function, running the function at once"""
+    func(arg)
+
+
+# custom imports
+sys.modules['machine.I2C'] = I2C
+to_be_mocked = [
+    'machine',
+    'time.sleep_ms', 'time.sleep_us',
+]
+for module in to_be_mocked:
+    sys.modules[module] = Mock()
+sys.modules['time.ticks_us'] = ticks_us
+sys.modules['time.ticks_ms'] = ticks_ms
+sys.modules['time.ticks_add'] = ticks_add
+sys.modules['time.ticks_diff'] = ticks_diff
+micropython = ModuleType('micropython')
+micropython.const = const
+micropython.schedule = schedule
+sys.modules['micropython'] = micropython
+asyncio.sleep_ms = sleep_ms
+
+from lcd_i2c import const as Const  # noqa: E402
+
+
+def decode(frames: bytes) -> list:
+    """
+    Decode sent frames to tuples of (mode, value)
+
+    :param      frames:  The frames of 6 bytes each
+    :type       frames:  bytes
+
+    :returns:   The RS bit and the byte of each frame
+    :rtype:     list
+    """
+    decoded = []
+    for idx in range(0, len(frames), Const.FRAME_SIZE):
+        decoded.append((frames[idx] & Const.RS,
+                        (frames[idx] & 0xF0) | (frames[idx + 3] >> 4)))
+    return decoded
+
+
+class FrameRecorder(object):
+    """Mixin recording the data written to the fake I2C bus"""
+
+    def _writeto(self, addr: int, buf: bytearray) -> None:
+        """Keep a copy of the written data, buffers are reused"""
+        self._written.append(bytes(buf))
+
+    def _sent(self) -> list:
+        """
+        Decode and reset the written frames as list of (RS, value), writes
+        of single port expander bytes are skipped
+        """
+        data = b''.join(buf for buf in self._written
+                        if len(buf) % Const.FRAME_SIZE == 0)
+        self._written = []
+        return decode(frames=data)
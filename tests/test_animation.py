@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the LCD glyph animation"""
+
+import asyncio
+import importlib
+from unittest.mock import Mock, patch
+import sys
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin
+import lcd_i2c
+from lcd_i2c import LCD
+from lcd_i2c import const as Const
+from lcd_i2c.animation import GlyphAnimation
+from lcd_i2c.async_lcd import AsyncLCD
+
+
+class TestGlyphAnimation(FrameRecorder, unittest.TestCase):
+    """This class describes a TestGlyphAnimation unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        self._written: list = []
+        # spinner moving a dot from the top to the bottom row
+        self.frames = [
+            [0x04 if row == num else 0x00 for row in range(0, 8)]
+            for num in range(0, 3)
+        ]
+
+    def test_frames_required(self) -> None:
+        """Test an animation needs frames"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        with self.assertRaises(ValueError):
+            GlyphAnimation(lcd=lcd, frames=[])
+        for fps in (0, -1):
+            with self.assertRaises(ValueError):
+                GlyphAnimation(lcd=lcd, frames=self.frames, fps=fps)
+
+        animation = GlyphAnimation(lcd=lcd, frames=self.frames, location=9,
+                                   fps=25)
+        self.assertEqual(animation.location, 1)
+        self.assertEqual(animation.period_ms, 40)
+        self.assertFalse(animation.running)
+
+    def test_step(self) -> None:
+        """Test only the changed rows are written per frame"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        lcd.set_cursor(col=3, row=0)
+        animation = GlyphAnimation(lcd=lcd, frames=self.frames, location=2,
+                                   loop=False)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            # first frame is written completely
+            self.assertTrue(animation.step())
+            sent = self._sent()
+            self.assertEqual(len(sent), 10)
+            self.assertEqual(sent[0], (0, Const.LCD_SETCGRAMADDR | 16))
+            self.assertEqual(sent[-1], (0, Const.LCD_SETDDRAMADDR | 0x03))
+
+            # dot moves to the next row, both rows are consecutive
+            self.assertTrue(animation.step())
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETCGRAMADDR | 16),
+                 (Const.RS, 0x00),
+                 (Const.RS, 0x04),
+                 (0, Const.LCD_SETDDRAMADDR | 0x03)]
+            )
+
+            # last frame without loop
+            self.assertFalse(animation.step())
+            self.assertEqual(len(self._sent()), 4)
+
+        self.assertEqual(lcd._cgram[16:24], bytes(self.frames[2]))
+        self.assertEqual(lcd._address, 0x03)
+
+    def test_run(self) -> None:
+        """Test playing the frames at the frame rate"""
+        for lcd_class in (LCD, AsyncLCD):
+            lcd = lcd_class(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+            animation = GlyphAnimation(lcd=lcd, frames=self.frames, fps=100,
+                                       loop=False)
+
+            with patch.object(lcd, 'update_char',
+                              wraps=lcd.update_char) as mock_update_char:
+                asyncio.run(animation.run())
+
+            self.assertEqual(mock_update_char.call_count, 3)
+            self.assertEqual(lcd._cgram[:8], bytes(self.frames[2]))
+            self.assertFalse(animation.running)
+
+    def test_timer(self) -> None:
+        """Test frames scheduled by a timer"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        animation = GlyphAnimation(lcd=lcd, frames=self.frames, fps=20,
+                                   loop=False)
+        timer = Mock()
+
+        animation.start_timer(timer=timer)
+        self.assertTrue(animation.running)
+        kwargs = timer.init.call_args[1]
+        self.assertEqual(kwargs['period'], 50)
+
+        with patch.object(lcd, 'update_char') as mock_update_char:
+            for _ in range(0, 4):
+                kwargs['callback'](timer)
+        self.assertEqual(mock_update_char.call_count, 3)
+        self.assertFalse(animation.running)
+        timer.deinit.assert_called_once()
+
+    def test_without_asyncio(self) -> None:
+        """Test frames scheduled by a timer do not need asyncio"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+
+        # modules imported without asyncio are dropped afterwards
+        with patch.dict(sys.modules, {'asyncio': None}), \
+                patch.object(lcd_i2c, 'animation', lcd_i2c.animation):
+            sys.modules.pop('lcd_i2c.async_lcd', None)
+            sys.modules.pop('lcd_i2c.animation', None)
+            animation = importlib.import_module('lcd_i2c.animation')
+            self.assertNotIn('lcd_i2c.async_lcd', sys.modules)
+
+            spinner = animation.GlyphAnimation(lcd=lcd, frames=self.frames)
+            timer = Mock()
+            spinner.start_timer(timer=timer)
+            with patch.object(I2C, 'writeto', side_effect=self._writeto):
+                timer.init.call_args[1]['callback'](timer)
+            self.assertEqual(self._sent()[0], (0, Const.LCD_SETCGRAMADDR))
+            self.assertEqual(lcd._cgram[:8], bytes(self.frames[0]))
+            spinner.stop()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for MicroPython asyncio I2C LCD"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin
+from lcd_i2c import const as Const
+from lcd_i2c.async_lcd import AsyncLCD
+
+
+class TestAsyncLCD(FrameRecorder, unittest.TestCase):
+    """This class describes a TestAsyncLCD unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        self._written: list = []
+
+    def test_begin(self) -> None:
+        """Test begin awaits the long delays"""
+        lcd = AsyncLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c,
+                       freq=400_000)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            with patch('lcd_i2c.async_lcd.sleep_ms',
+                       new_callable=AsyncMock) as mock_sleep_ms:
+                with patch('lcd_i2c.lcd_i2c.sleep_ms') as mock_sync_sleep_ms:
+                    asyncio.run(lcd.begin())
+                    mock_sync_sleep_ms.assert_not_called()
+                    # padded power on delays and 3 function set nibbles of
+                    # 4.5ms each, the remaining time is waited blocking
+                    self.assertEqual(
+                        [call[0][0] for call in
+                         mock_sleep_ms.await_args_list[:5]],
+                        [50, 1000, 4, 4, 4]
+                    )
+
+                    mock_sleep_ms.reset_mock()
+                    asyncio.run(lcd.begin(fast=True))
+                    awaited = [call[0][0] for call in
+                               mock_sleep_ms.await_args_list]
+                    self.assertEqual(awaited[0], Const.POWER_ON_DELAY_MS)
+                    # first function set nibble takes more than 4.1ms, the
+                    # return home of the previous begin may be awaited before
+                    self.assertIn(4, awaited[1:3])
+
+        self.assertEqual(lcd._address, 0)
+        self.assertTrue(lcd._shadow_valid)
+        self.assertGreater(lcd.init_time_us, 0)
+
+        # 8 bit function set nibbles are not decoded as frames
+        self._written = self._written[-3:]
+        self.assertEqual(
+            self._sent(),
+            [(0, 0x32),
+             (0, Const.LCD_FUNCTIONSET | Const.LCD_2LINE),
+             (0, Const.LCD_DISPLAYCONTROL | Const.LCD_DISPLAYON),
+             (0, Const.LCD_CLEARDISPLAY),
+             (0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT)]
+        )
+
+    def test_print(self) -> None:
+        """Test printing awaits a clear and yields between rows"""
+        lcd = AsyncLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+
+        async def run() -> None:
+            await lcd.begin(fast=True)
+            mock_sleep_ms.reset_mock()
+            self._written = []
+            await lcd.set_cursor(col=0, row=0)
+            # display content unknown, the clear instruction is sent
+            lcd._shadow_valid = False
+            await lcd.clear()
+            await lcd.print("Hello World, how are you")
+            await lcd.home()
+            await lcd.create_char(location=0, charmap=[0x1F] * 8)
+
+        async def sleep_ms(t: int) -> None:
+            await asyncio.sleep(t / 1000)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            with patch('lcd_i2c.async_lcd.sleep_ms',
+                       new=AsyncMock(side_effect=sleep_ms)) as mock_sleep_ms:
+                with patch('lcd_i2c.lcd_i2c.sleep_us') as mock_sleep_us:
+                    asyncio.run(run())
+
+        # clear display is awaited, followed by a yield per row chunk, only
+        # short waits are left to block
+        self.assertEqual(mock_sleep_ms.await_args_list[0][0][0], 1)
+        self.assertEqual(mock_sleep_ms.await_count, 3)
+        for call in mock_sleep_us.call_args_list:
+            self.assertLess(call[0][0], 1000)
+
+        sent = self._sent()
+        self.assertEqual(sent[0], (0, Const.LCD_CLEARDISPLAY))
+        self.assertEqual(bytes(value for _, value in sent[1:25]),
+                         b"Hello World, how are you")
+        self.assertEqual(sent[25], (0, Const.LCD_SETDDRAMADDR))
+        self.assertEqual(lcd._cgram[:8], bytes([0x1F] * 8))
+
+    def test_lock(self) -> None:
+        """Test tasks sharing the display do not interleave"""
+        lcd = AsyncLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+
+        async def first() -> None:
+            async with lcd:
+                await lcd.set_cursor(col=0, row=1)
+                await lcd.print("A" * 20)
+
+        async def second() -> None:
+            await lcd.print("B" * 3)
+
+        async def run() -> None:
+            await lcd.begin(fast=True)
+            self._written = []
+            await asyncio.gather(first(), second())
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            asyncio.run(run())
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+            [(1, ord('A'))] * 20 +
+            [(1, ord('B'))] * 3
+        )
+        self.assertFalse(lcd._lock.locked())
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
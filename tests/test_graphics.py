@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the LCD pseudo graphics"""
+
+from unittest.mock import patch
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin
+from lcd_i2c import LCD
+from lcd_i2c import const as Const
+from lcd_i2c.graphics import BarGraph, TileRenderer
+
+
+class TestTileRenderer(FrameRecorder, unittest.TestCase):
+    """This class describes a TestTileRenderer unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        self._written: list = []
+
+    def _lcd(self) -> LCD:
+        """Get a LCD with a known address counter"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        return lcd
+
+    def test_area(self) -> None:
+        """Test the area has to be on the display"""
+        lcd = self._lcd()
+        with self.assertRaises(ValueError):
+            TileRenderer(lcd=lcd, col=12, row=0, width=5)
+        with self.assertRaises(ValueError):
+            TileRenderer(lcd=lcd, col=0, row=1, width=4, height=2)
+
+        renderer = TileRenderer(lcd=lcd, col=0, row=0, width=4, height=2)
+        self.assertEqual(renderer.pixel_width, 20)
+        self.assertEqual(renderer.pixel_height, 16)
+
+    def test_draw(self) -> None:
+        """Test blank, full and identical tiles are deduplicated"""
+        lcd = self._lcd()
+        renderer = TileRenderer(lcd=lcd, col=2, row=1, width=4)
+
+        # blank, full, a horizontal line in the two last cells
+        bitmap = [0b00000_11111_00000_00000] * 8
+        bitmap[7] = 0b00000_11111_11111_11111
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            self.assertTrue(renderer.draw(bitmap=bitmap))
+        self.assertEqual(renderer.tiles, 1)
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETCGRAMADDR | 0)] +
+            [(Const.RS, 0x00)] * 7 + [(Const.RS, 0x1F)] +
+            [(0, Const.LCD_SETDDRAMADDR | 0x42),
+             (Const.RS, Const.CHAR_BLANK),
+             (Const.RS, Const.CHAR_FULL_BLOCK),
+             (Const.RS, 0),
+             (Const.RS, 0)]
+        )
+
+        # line moves up in the last cell, only this cell is changed
+        bitmap[6] = 0b00000_11111_00000_11111
+        bitmap[7] = 0b00000_11111_11111_00000
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            self.assertTrue(renderer.draw(bitmap=bitmap))
+        self.assertEqual(renderer.tiles, 2)
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETCGRAMADDR | 8)] +
+            [(Const.RS, 0x00)] * 6 + [(Const.RS, 0x1F), (Const.RS, 0x00)] +
+            [(0, Const.LCD_SETDDRAMADDR | 0x45),
+             (Const.RS, 1)]
+        )
+
+        # same frame again, nothing to send
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            self.assertTrue(renderer.draw(bitmap=bitmap))
+        self.assertEqual(self._written, [])
+
+    def test_draw_reuse_rows(self) -> None:
+        """Test a new tile replaces the location with the least changes"""
+        lcd = self._lcd()
+        renderer = TileRenderer(lcd=lcd, col=0, row=0, width=2,
+                                locations=[3, 4])
+        bitmap = [0b00001_10000] * 8
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            self.assertTrue(renderer.draw(bitmap=bitmap))
+            self._sent()
+
+            # second cell changes a single row
+            bitmap[0] = 0b00001_11000
+            self.assertTrue(renderer.draw(bitmap=bitmap))
+
+        # the cell keeps its character code, no DDRAM write is needed, but
+        # the address counter is moved back from the CGRAM
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETCGRAMADDR | 32), (Const.RS, 0x18),
+             (0, Const.LCD_SETDDRAMADDR | 0x02)]
+        )
+        self.assertEqual(lcd._address, 0x02)
+        self.assertEqual(lcd._cgram[24:32], bytes([0x01] * 8))
+
+        # text printed afterwards goes to the DDRAM
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("x")
+        self.assertEqual(self._sent(), [(Const.RS, ord('x'))])
+        self.assertEqual(lcd._address, 0x03)
+
+    def test_draw_too_many_tiles(self) -> None:
+        """Test a frame with more tiles than locations is not drawn"""
+        lcd = self._lcd()
+        renderer = TileRenderer(lcd=lcd, col=0, row=0, width=3,
+                                locations=[0, 1])
+        bitmap = [0b00001_00010_00100] * 8
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            self.assertFalse(renderer.draw(bitmap=bitmap))
+        self.assertEqual(renderer.tiles, 3)
+        self.assertEqual(self._written, [])
+
+    def test_bar_graph_area(self) -> None:
+        """Test the bar and its custom characters have to fit"""
+        lcd = self._lcd()
+        with self.assertRaises(ValueError):
+            BarGraph(lcd=lcd, col=10, row=0, width=7)
+        with self.assertRaises(ValueError):
+            BarGraph(lcd=lcd, col=0, row=2, width=4)
+        with self.assertRaises(ValueError):
+            BarGraph(lcd=lcd, col=0, row=0, width=4, location=5)
+
+        bar = BarGraph(lcd=lcd, col=0, row=0, width=4, location=4)
+        self.assertEqual(bar.max_level, 20)
+        self.assertEqual(lcd._cgram_valid, 0xF0)
+        self.assertEqual(lcd._cgram[32:40], bytes([0x10] * 8))
+        self.assertEqual(lcd._cgram[56:64], bytes([0x1E] * 8))
+
+    def test_bar_graph(self) -> None:
+        """Test only the cells with a changed fill are written"""
+        lcd = self._lcd()
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            first = BarGraph(lcd=lcd, col=2, row=0, width=4)
+            # 4 custom characters and the restored DDRAM address
+            self.assertEqual(len(self._sent()), 1 + 4 * 8 + 1)
+
+            # glyphs are shared
+            second = BarGraph(lcd=lcd, col=2, row=1, width=4)
+            self.assertEqual(self._written, [])
+
+            # first draw writes all cells
+            first.set_level(level=7)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x02),
+                 (Const.RS, Const.CHAR_FULL_BLOCK),
+                 (Const.RS, 1),
+                 (Const.RS, Const.CHAR_BLANK),
+                 (Const.RS, Const.CHAR_BLANK)]
+            )
+
+            # within a cell
+            first.set_level(level=9)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x03), (Const.RS, 3)]
+            )
+
+            # crossing a cell border
+            first.set_level(level=11)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x03),
+                 (Const.RS, Const.CHAR_FULL_BLOCK),
+                 (Const.RS, 0)]
+            )
+
+            # completely filled and back to a cell border, level is limited
+            first.set_level(level=100)
+            self.assertEqual(first.level, 20)
+            self._sent()
+            first.set_level(level=10)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x04),
+                 (Const.RS, Const.CHAR_BLANK),
+                 (Const.RS, Const.CHAR_BLANK)]
+            )
+
+            # unchanged level, nothing to send
+            first.set_level(level=10)
+            self.assertEqual(self._written, [])
+
+            second.set_value(value=50, maximum=100)
+            self.assertEqual(second.level, 10)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x42),
+                 (Const.RS, Const.CHAR_FULL_BLOCK),
+                 (Const.RS, Const.CHAR_FULL_BLOCK),
+                 (Const.RS, Const.CHAR_BLANK),
+                 (Const.RS, Const.CHAR_BLANK)]
+            )
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,46 +4,19 @@
 """Unittest for MicroPython I2C LCD"""
 
 import logging
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from nose2.tools import params
 import sys
+import tracemalloc
 import unittest
 
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin, decode, ticks_add, ticks_us
+from lcd_i2c import LCD
+from lcd_i2c import const as Const
 
-class Pin(object):
-    """Fake MicroPython Pin class"""
-    def __init__(self, pin: int, mode: int = -1):
-        self._pin = pin
-        self._mode = mode
-        self._value = 0
 
-
-class I2C(object):
-    """Fake MicroPython I2C class"""
-    def __init__(self, id: int, *, scl: Pin, sda: Pin, freq: int = 400000):
-        self._id = id
-        self._scl = scl
-        self._sda = sda
-        self._freq = freq
-
-    def writeto(addr: int, buf: bytearray, stop: bool = True) -> int:
-        return 1
-
-
-# custom imports
-sys.modules['machine.I2C'] = I2C
-to_be_mocked = [
-    'machine',
-    'time.sleep_ms', 'time.sleep_us',
-]
-for module in to_be_mocked:
-    sys.modules[module] = Mock()
-
-from lcd_i2c import LCD             # noqa: E402
-from lcd_i2c import const as Const  # noqa: E402
-
-
-class TestLCD(unittest.TestCase):
+class TestLCD(FrameRecorder, unittest.TestCase):
     """This class describes a TestLCD unittest."""
 
     def setUp(self) -> None:
@@ -70,6 +43,7 @@ class TestLCD(unittest.TestCase):
         self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
         self._calls_counter = 0
         self._tracked_call_data: list = []
+        self._written: list = []
 
     def _tracked_call(self, *args, **kwargs) -> None:
         """Track function calls and the used arguments"""
@@ -165,7 +139,18 @@ class TestLCD(unittest.TestCase):
 
         # double row display
         lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
-        lcd.begin()
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            with patch('lcd_i2c.lcd_i2c.sleep_ms') as mock_sleep_ms, \
+                    patch('lcd_i2c.lcd_i2c.sleep_us') as mock_sleep_us:
+                lcd.begin()
+
+        # padded power on delays and 3 function set nibbles of 4.5ms each
+        self.assertEqual([call[0][0] for call in mock_sleep_ms.call_args_list],
+                         [50, 1000])
+        self.assertEqual(self._written[1:4], [bytes([0x38, 0x3C, 0x38])] * 3)
+        waits = [call[0][0] for call in mock_sleep_us.call_args_list]
+        self.assertEqual(
+            len([us for us in waits if us > Const.INIT_FIRST_WAIT_US]), 3)
 
         # self.assertEqual(lcd._i2c._id, self.i2c._id)
         self.assertEqual(lcd._display_function, 0x8)
@@ -352,16 +337,1064 @@ class TestLCD(unittest.TestCase):
 
         text = "Hello"
 
-        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
-            lcd.print(text)
+        with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+            with patch('lcd_i2c.LCD._command',
+                       wraps=self._tracked_call):
+                lcd.print(text)
 
-        # called 1x to much
-        self.assertEqual(len(self._tracked_call_data) - 1, len(text))
+        # whole text is sent as one transaction, no per char command and the
+        # cursor is already at the address incremented by the controller
+        mock_writeto.assert_called_once()
+        self.assertEqual(len(self._tracked_call_data), 0)
         self.assertEqual(lcd.cursor_position, (0 + len(text), 0))
 
+        frame = bytes(mock_writeto.call_args[0][1])
+        self.assertEqual(len(frame), len(text) * Const.FRAME_SIZE)
         for idx, val in enumerate(text):
-            self.assertEqual(self._tracked_call_data[idx]['kwargs']['value'],
-                             ord(val))
+            chunk = frame[idx * Const.FRAME_SIZE:(idx + 1) * Const.FRAME_SIZE]
+            value = (chunk[0] & 0xF0) | (chunk[3] >> 4)
+            self.assertEqual(value, ord(val))
+            self.assertTrue(all(x & Const.RS for x in chunk))
+            self.assertEqual(chunk[1] & Const.EN, Const.EN)
+            self.assertEqual(chunk[4] & Const.EN, Const.EN)
+
+    def test_print_long_text(self) -> None:
+        """Test print of text longer than one row"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        text = "x" * 20
+
+        with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+            with patch('lcd_i2c.LCD._command',
+                       wraps=self._tracked_call):
+                lcd.print(text)
+
+        # one transaction per row of columns and an address instruction
+        self.assertEqual(mock_writeto.call_count, 2)
+        self.assertEqual(len(mock_writeto.call_args_list[0][0][1]),
+                         17 * Const.FRAME_SIZE)
+        self.assertEqual(len(mock_writeto.call_args_list[1][0][1]),
+                         3 * Const.FRAME_SIZE)
+
+    def test_print_no_allocation(self) -> None:
+        """Test steady state printing does not allocate memory"""
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c)
+        text = "Steady state 1234567"
+        charmap = [0x1F] * 8
+        buf = lcd._buf
+        peaks = []
+
+        def ticks_us() -> int:
+            """Small ticks, which are no objects like on MicroPython"""
+            return 0
+
+        def sleep_us(us: int) -> None:
+            """Wait without the allocations of a mock"""
+            pass
+
+        with patch('lcd_i2c.lcd_i2c.ticks_us', new=ticks_us), \
+                patch('lcd_i2c.lcd_i2c.sleep_us', new=sleep_us):
+            # warm up
+            lcd._busy_until = 0
+            lcd.set_cursor(col=0, row=0)
+            lcd.print(text)
+
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                for row in range(0, 4):
+                    # short-lived garbage is only visible by the peak
+                    tracemalloc.reset_peak()
+                    size = tracemalloc.get_traced_memory()[0]
+                    lcd.set_cursor(col=0, row=row)
+                    lcd.print(text)
+                    lcd.create_char(location=row, charmap=charmap)
+                    peaks.append(tracemalloc.get_traced_memory()[1] - size)
+                after = tracemalloc.take_snapshot()
+            finally:
+                tracemalloc.stop()
+
+        only_driver = [tracemalloc.Filter(True, '*lcd_i2c*lcd_i2c.py')]
+        stats = after.filter_traces(only_driver).compare_to(
+            before.filter_traces(only_driver), 'lineno')
+        self.assertEqual(sum(stat.size_diff for stat in stats), 0)
+        self.assertEqual(sum(stat.count_diff for stat in stats), 0)
+        self.assertIs(lcd._buf, buf)
+
+        # CPython allocates integers above 256, MicroPython does not. Any
+        # slice, view or list is larger than the few integers alive at once.
+        for peak in peaks:
+            self.assertLess(peak, sys.getsizeof(memoryview(b'')))
+
+    def test_command(self) -> None:
+        """Test sending a byte as single I2C transaction"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+
+        with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+            lcd._command(value=0x41, mode=Const.RS)
+
+        mock_writeto.assert_called_once()
+        addr, frame = mock_writeto.call_args[0]
+        self.assertEqual(addr, 0x27)
+        self.assertEqual(bytes(frame),
+                         bytes([0x49, 0x4D, 0x49, 0x19, 0x1D, 0x19]))
+
+        # backlight bit is part of every frame byte
+        lcd.no_backlight()
+        with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+            lcd._command(value=Const.LCD_CLEARDISPLAY)
+
+        self.assertEqual(bytes(mock_writeto.call_args[0][1]),
+                         bytes([0x00, 0x04, 0x00, 0x10, 0x14, 0x10]))
+
+    def test_lut(self) -> None:
+        """Test frame lookup table is only rebuilt on backlight change"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+
+        idx = (0x100 | ord('A')) * Const.FRAME_SIZE
+        self.assertEqual(bytes(lcd._lut[idx:idx + Const.FRAME_SIZE]),
+                         bytes([0x49, 0x4D, 0x49, 0x19, 0x1D, 0x19]))
+
+        with patch('lcd_i2c.LCD._build_lut',
+                   wraps=self._tracked_call):
+            # backlight is on by default
+            lcd.backlight()
+            lcd.set_backlight(new_val=True)
+            self.assertEqual(len(self._tracked_call_data), 0)
+
+            lcd.no_backlight()
+            lcd.no_backlight()
+            self.assertEqual(len(self._tracked_call_data), 1)
+
+            lcd.backlight()
+            self.assertEqual(len(self._tracked_call_data), 2)
+
+        lcd.no_backlight()
+        self.assertEqual(bytes(lcd._lut[idx:idx + Const.FRAME_SIZE]),
+                         bytes([0x41, 0x45, 0x41, 0x11, 0x15, 0x11]))
+
+    def test_deadline(self) -> None:
+        """Test waiting only the remaining execution time of the controller"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=100000)
+        self.assertEqual(lcd.freq, 100000)
+
+        with patch('lcd_i2c.lcd_i2c.sleep_us') as mock_sleep_us:
+            lcd.clear()
+            mock_sleep_us.assert_not_called()
+
+            # long instruction is still executed, wait for the remaining time
+            lcd.print("a")
+            mock_sleep_us.assert_called_once()
+            waited = mock_sleep_us.call_args[0][0]
+            self.assertGreater(waited, 0)
+            self.assertLessEqual(waited,
+                                 Const.EXEC_TIME_LONG_US - lcd._latch_time_us)
+
+            # the bus transfer time covers the time of a normal instruction
+            mock_sleep_us.reset_mock()
+            lcd.print("b")
+            lcd.set_cursor(col=0, row=1)
+            lcd.create_char(location=0, charmap=[0x1F] * 8)
+            mock_sleep_us.assert_not_called()
+
+            # nothing to wait for if the deadline is already over
+            lcd.home()
+            lcd._busy_until = ticks_us() - 1
+            lcd.print("c")
+            mock_sleep_us.assert_not_called()
+
+    def test_fast_bus_frames(self) -> None:
+        """Test frames are sent one by one if the bus outruns the LCD"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=400000)
+        self.assertEqual(lcd._frames_per_write, 17)
+
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=2000000)
+        self.assertEqual(lcd._frames_per_write, 1)
+
+        with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+            lcd.print("abc")
+
+        # one write per char and one to set the cursor
+        self.assertEqual(mock_writeto.call_count, 4)
+
+    def test_busy_flag(self) -> None:
+        """Test polling the busy flag instead of waiting"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, busy_flag=True)
+        self.assertTrue(lcd.busy_flag)
+        lcd.begin(fast=True)
+        self.assertTrue(lcd.busy_flag)
+        # sleeps are mocked, consider the begin sequence as executed
+        lcd._busy_until = ticks_us()
+
+        # controller is busy for two reads, both nibbles are read each time
+        responses = [0x80, 0x00, 0x80, 0x00, 0x00, 0x00]
+
+        def readfrom_into(addr: int, buf: bytearray) -> None:
+            buf[0] = responses.pop(0)
+
+        with patch.object(I2C, 'readfrom_into',
+                          side_effect=readfrom_into) as mock_readfrom_into:
+            with patch.object(I2C, 'writeto', return_value=1) as mock_writeto:
+                with patch('lcd_i2c.lcd_i2c.sleep_us') as mock_sleep_us:
+                    # use the clear instruction, screen is blank already
+                    lcd._clear_display()
+                    lcd.print("a")
+
+        mock_sleep_us.assert_not_called()
+        self.assertEqual(mock_readfrom_into.call_count, 6)
+        self.assertEqual(len(responses), 0)
+        # strobe with data pins as inputs, R/W and EN high
+        self.assertEqual(bytes(mock_writeto.call_args_list[1][0][1]),
+                         bytes([0xFA, 0xFE]))
+
+        # normal instructions are faster than polling
+        with patch.object(I2C, 'readfrom_into') as mock_readfrom_into:
+            lcd.print("bc")
+            lcd.create_char(location=0, charmap=[0x1F] * 8)
+        mock_readfrom_into.assert_not_called()
+
+        # resume probes the busy flag at address zero
+        lcd.resume()
+        self.assertTrue(lcd.busy_flag)
+        self.assertEqual(lcd._address, 0)
+
+    def test_busy_flag_rw_tied_low(self) -> None:
+        """Test falling back to timed waits if the R/W pin is tied low"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, busy_flag=True)
+
+        def readfrom_into(addr: int, buf: bytearray) -> None:
+            # written data pins are read back
+            buf[0] = 0xFA
+
+        with patch.object(I2C, 'readfrom_into', side_effect=readfrom_into):
+            lcd.begin(fast=True)
+        self.assertFalse(lcd.busy_flag)
+
+        # the read strobes are latched as instruction to set address 0x7F
+        lcd._address = 0
+        with patch.object(I2C, 'readfrom_into', side_effect=readfrom_into):
+            self.assertFalse(lcd._probe_busy_flag())
+        self.assertEqual(lcd._address, -1)
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.set_cursor(col=0, row=0)
+            lcd.print("x")
+        self.assertEqual(self._sent(),
+                         [(0, Const.LCD_SETDDRAMADDR), (Const.RS, ord('x'))])
+
+        # polling gives up after a timeout
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, busy_flag=True)
+        with patch.object(I2C, 'readfrom_into', side_effect=readfrom_into):
+            lcd._clear_display()
+            lcd._busy_until = ticks_add(ticks_us(), Const.EXEC_TIME_LONG_US)
+            lcd._wait_ready()
+        self.assertFalse(lcd.busy_flag)
+        self.assertEqual(lcd._address, -1)
+
+        # resume does not poll before the busy flag has been probed
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, busy_flag=True)
+        with patch.object(I2C, 'readfrom_into',
+                          side_effect=readfrom_into) as mock_readfrom_into:
+            lcd.resume()
+        self.assertFalse(lcd.busy_flag)
+        self.assertEqual(lcd._address, -1)
+        self.assertEqual(mock_readfrom_into.call_count, 2)
+        self.assertLess(lcd.init_time_us, Const.BUSY_TIMEOUT_US)
+
+    def test_framebuffer(self) -> None:
+        """Test printing into framebuffer and showing only changed cells"""
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c, framebuffer=True)
+        lcd.begin(fast=True)
+        self.assertEqual(len(lcd.framebuffer), 80)
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.set_cursor(col=0, row=0)
+            lcd.print("Temperature is 21.5C")
+            lcd.set_cursor(col=0, row=2)
+            lcd.print("Hum: 45 %")
+            # text beyond the last column is cut off
+            lcd.set_cursor(col=18, row=3)
+            lcd.print("abcd")
+            mock_writeto.assert_not_called()
+            self.assertEqual(lcd.cursor_position, (22, 3))
+            self.assertEqual(bytes(lcd.framebuffer[60:]),
+                             b' ' * 18 + b'ab')
+
+            lcd.show()
+
+        # address counter is already at zero after begin
+        rs = Const.RS
+        self.assertEqual(
+            self._sent(),
+            [(rs, ord(c)) for c in "Temperature is 21.5C"] +
+            # row 2 continues at the auto incremented address of row 0
+            [(rs, ord(c)) for c in "Hum: 45 %"] +
+            [(0, Const.LCD_SETDDRAMADDR | (0x54 + 18))] +
+            [(rs, ord(c)) for c in "ab"]
+        )
+
+        # nothing changed, nothing to send
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.show()
+        mock_writeto.assert_not_called()
+
+        # only changed digits are sent, a single unchanged cell is sent along
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.set_cursor(col=15, row=0)
+            lcd.print("22.7")
+            lcd.show()
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x10)] +
+            [(rs, ord(c)) for c in "2.7"]
+        )
+
+    def test_framebuffer_clear_home(self) -> None:
+        """Test clear and home in framebuffer mode"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        lcd.begin(fast=True)
+        lcd.print("Hello")
+        lcd.show()
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.home()
+            self.assertEqual(lcd.cursor_position, (0, 0))
+            lcd.set_cursor(col=3, row=1)
+            lcd.clear()
+            self.assertEqual(lcd.cursor_position, (0, 0))
+            mock_writeto.assert_not_called()
+            self.assertEqual(bytes(lcd.framebuffer), b' ' * 32)
+
+            lcd.print("Help")
+            lcd.show()
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x03), (Const.RS, ord('p')),
+             (Const.RS, ord(' '))]
+        )
+
+        # visible cursor is at its position after showing
+        lcd.cursor()
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.print("!")
+            lcd.show()
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x04), (Const.RS, ord('!'))]
+        )
+
+        # visible cursor is moved to its position after showing
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.set_cursor(col=3, row=1)
+            lcd.print("x")
+            lcd.set_cursor(col=0, row=0)
+            lcd.show()
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x43), (Const.RS, ord('x')),
+             (0, Const.LCD_SETDDRAMADDR | 0x00)]
+        )
+
+    def test_framebuffer_text_flow(self) -> None:
+        """Test showing the framebuffer with right to left and autoscroll"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        lcd.begin(fast=True)
+        lcd.right_to_left()
+        lcd.print("abc")
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.show()
+
+        # runs are sent left to right, the entry mode is restored
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT)] +
+            [(Const.RS, ord(c)) for c in "abc"] +
+            [(0, Const.LCD_ENTRYMODESET)]
+        )
+        self.assertEqual(lcd._display_mode, 0)
+        self.assertEqual(lcd._address, 0x03)
+
+        lcd.left_to_right()
+        lcd.autoscroll()
+        lcd.set_cursor(col=5, row=1)
+        lcd.print("d")
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.show()
+        mode = Const.LCD_ENTRYLEFT | Const.LCD_ENTRYSHIFTINCREMENT
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT),
+             (0, Const.LCD_SETDDRAMADDR | 0x45),
+             (Const.RS, ord('d')),
+             (0, Const.LCD_ENTRYMODESET | mode)]
+        )
+
+        # nothing changed, the entry mode is kept
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.show()
+        self.assertEqual(self._written, [])
+
+    def test_framebuffer_resume(self) -> None:
+        """Test all cells are sent if the display content is unknown"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        lcd.resume()
+        lcd.print("Hi")
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.show()
+
+        # stale cells of the previous content are overwritten
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x00)] +
+            [(Const.RS, value) for value in b"Hi" + b" " * 14] +
+            [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+            [(Const.RS, ord(' '))] * 16
+        )
+        self.assertFalse(lcd._shadow_valid)
+
+        # afterwards only the changed cells are sent
+        lcd.print("!")
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.show()
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x02), (Const.RS, ord('!'))]
+        )
+
+    def test_address_counter(self) -> None:
+        """Test skipping redundant DDRAM address instructions"""
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c)
+        lcd.begin(fast=True)
+        self.assertEqual(lcd._address, 0)
+
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.set_cursor(col=0, row=0)
+            self.assertEqual(len(self._tracked_call_data), 0)
+
+            lcd.set_cursor(col=5, row=1)
+            self.assertEqual(len(self._tracked_call_data), 1)
+            self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                             Const.LCD_SETDDRAMADDR | 0x45)
+            lcd.set_cursor(col=5, row=1)
+            self.assertEqual(len(self._tracked_call_data), 1)
+
+        # consecutive prints across a row need no address instruction
+        with patch('lcd_i2c.LCD._command',
+                   wraps=self._tracked_call) as mock_command:
+            lcd.print("abc")
+            lcd.set_cursor(col=8, row=1)
+            lcd.print("def")
+        self.assertEqual(lcd._address, 0x4B)
+        self.assertEqual(lcd.cursor_position, (11, 1))
+        mock_command.assert_not_called()
+
+        # first row continues in the third row
+        lcd.set_cursor(col=18, row=0)
+        lcd.print("xy")
+        self.assertEqual(lcd._address, 0x14)
+
+        # address counter wraps at the end of both lines
+        lcd._address = 0x26
+        lcd._advance_address(count=3)
+        self.assertEqual(lcd._address, 0x41)
+        lcd._address = 0x66
+        lcd._advance_address(count=2)
+        self.assertEqual(lcd._address, 0x00)
+
+        # address counter decrements for right to left text flow
+        lcd.right_to_left()
+        lcd._advance_address(count=1)
+        self.assertEqual(lcd._address, 0x67)
+        lcd._address = 0x45
+        lcd._advance_address(count=2)
+        self.assertEqual(lcd._address, 0x43)
+
+        # unknown address counter after writing to CGRAM
+        lcd.create_char(location=0, charmap=[0x1F] * 8)
+        self.assertEqual(lcd._address, -1)
+        with patch('lcd_i2c.LCD._command',
+                   wraps=self._tracked_call) as mock_command:
+            lcd.set_cursor(col=0, row=0)
+        mock_command.assert_called_once()
+
+    def test_address_counter_single_line(self) -> None:
+        """Test address counter wrap on single line displays"""
+        lcd = LCD(addr=0x27, cols=16, rows=1, i2c=self.i2c)
+        lcd.begin(fast=True)
+
+        lcd._address = 0x4E
+        lcd._advance_address(count=3)
+        self.assertEqual(lcd._address, 0x01)
+
+    def test_cheap_home(self) -> None:
+        """Test home sets the address if the display is not shifted"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        lcd.set_cursor(col=3, row=1)
+
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.home()
+        self.assertEqual(len(self._tracked_call_data), 1)
+        self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                         Const.LCD_SETDDRAMADDR | 0x00)
+        self.assertEqual(lcd.cursor_position, (0, 0))
+
+        # return home instruction is needed to undo the display shift
+        lcd.scroll_display_left()
+        lcd.scroll_display_left()
+        lcd.scroll_display_right()
+        self.assertEqual(lcd._shift, 1)
+        self._tracked_call_data.clear()
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.home()
+        self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                         Const.LCD_RETURNHOME)
+        self.assertEqual(lcd._shift, 0)
+
+        # autoscroll shifts the display with every character
+        lcd.autoscroll()
+        lcd.print("ab")
+        self.assertEqual(lcd._shift, 2)
+
+    def test_cheap_clear(self) -> None:
+        """Test clear overwrites few non blank cells"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=400_000)
+        lcd.begin(fast=True)
+        lcd.set_cursor(col=2, row=1)
+        lcd.print("ab")
+        self.assertEqual(bytes(lcd._shadow[16:20]), b'  ab')
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.clear()
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x42),
+             (Const.RS, ord(' ')), (Const.RS, ord(' ')),
+             (0, Const.LCD_SETDDRAMADDR | 0x00)]
+        )
+        self.assertEqual(mock_writeto.call_count, 2)
+        self.assertEqual(bytes(lcd._shadow), b' ' * 32)
+        self.assertEqual(lcd.cursor_position, (0, 0))
+
+        # clear instruction is faster for many non blank cells
+        lcd.print("Hello World")
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.clear()
+        self.assertEqual(len(self._tracked_call_data), 1)
+        self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                         Const.LCD_CLEARDISPLAY)
+
+        # unknown content after printing beyond the shown cells
+        lcd.set_cursor(col=15, row=0)
+        lcd.print("ab")
+        self.assertFalse(lcd._shadow_valid)
+        self._tracked_call_data.clear()
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.clear()
+        self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                         Const.LCD_CLEARDISPLAY)
+        self.assertTrue(lcd._shadow_valid)
+
+        # shifted display needs the clear instruction
+        lcd.print("a")
+        lcd.scroll_display_left()
+        self._tracked_call_data.clear()
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.clear()
+        self.assertEqual(self._tracked_call_data[0]['kwargs']['value'],
+                         Const.LCD_CLEARDISPLAY)
+
+    def test_begin_fast(self) -> None:
+        """Test fast LCD begin"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=400000)
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            with patch('lcd_i2c.lcd_i2c.sleep_ms') as mock_sleep_ms:
+                lcd.begin(fast=True)
+
+        mock_sleep_ms.assert_called_once_with(Const.POWER_ON_DELAY_MS)
+        self.assertGreater(lcd.init_time_us, 0)
+
+        # expander reset, 2 single nibbles, batched sequence and entry mode
+        self.assertEqual(mock_writeto.call_count, 5)
+        self.assertEqual(self._written[0], bytes([Const.LCD_BACKLIGHT]))
+        self.assertEqual(self._written[1], bytes([0x38, 0x3C, 0x38]))
+        self.assertEqual(self._written[2], bytes([0x38, 0x3C, 0x38]))
+        self._written = self._written[3:]
+        self.assertEqual(
+            self._sent(),
+            [(0, 0x32),
+             (0, Const.LCD_FUNCTIONSET | Const.LCD_2LINE),
+             (0, Const.LCD_DISPLAYCONTROL | Const.LCD_DISPLAYON),
+             (0, Const.LCD_CLEARDISPLAY),
+             (0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT)]
+        )
+
+        # same state as the default begin
+        self.assertEqual(lcd._display_function, 0x8)
+        self.assertEqual(lcd._display_control, 0x4)
+        self.assertEqual(lcd._display_mode, 2)
+        self.assertEqual(lcd.cursor_position, (0, 0))
+        self.assertEqual(lcd._address, 0)
+        self.assertTrue(lcd._shadow_valid)
+
+        # nibbles are sent one by one if the bus is too fast
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=1000000)
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            lcd.begin(fast=True)
+        self.assertEqual(mock_writeto.call_count, 7)
+
+    def test_resume(self) -> None:
+        """Test adopting an initialized display without clearing it"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=400_000)
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            with patch('lcd_i2c.lcd_i2c.sleep_ms') as mock_sleep_ms:
+                lcd.resume()
+
+        mock_sleep_ms.assert_not_called()
+        self.assertGreater(lcd.init_time_us, 0)
+
+        # expander reset, 2 single nibbles and batched sequence
+        self.assertEqual(mock_writeto.call_count, 4)
+        self.assertEqual(self._written[1], bytes([0x38, 0x3C, 0x38]))
+        self.assertEqual(self._written[2], bytes([0x38, 0x3C, 0x38]))
+        self._written = self._written[3:]
+        sent = self._sent()
+        self.assertEqual(
+            sent,
+            [(0, 0x32),
+             (0, Const.LCD_FUNCTIONSET | Const.LCD_2LINE),
+             (0, Const.LCD_DISPLAYCONTROL | Const.LCD_DISPLAYON),
+             (0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT)]
+        )
+        self.assertNotIn((0, Const.LCD_CLEARDISPLAY), sent)
+
+        self.assertEqual(lcd._display_function, 0x8)
+        self.assertEqual(lcd._display_control, 0x4)
+        self.assertEqual(lcd._display_mode, 2)
+        self.assertEqual(lcd._address, -1)
+        self.assertFalse(lcd._shadow_valid)
+
+        # address is set, as the address counter is unknown
+        with patch('lcd_i2c.LCD._command', wraps=self._tracked_call):
+            lcd.set_cursor(col=0, row=0)
+        self.assertEqual(len(self._tracked_call_data), 1)
+
+        # configured display control and mode are restored
+        lcd.cursor()
+        lcd.right_to_left()
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.resume()
+        self._written = self._written[3:]
+        self.assertEqual(
+            self._sent()[2:],
+            [(0, Const.LCD_DISPLAYCONTROL | 0x6),
+             (0, Const.LCD_ENTRYMODESET | 0x0)]
+        )
+
+    def test_state(self) -> None:
+        """Test persisting and restoring the driver and display state"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, freq=400_000)
+        lcd.begin(fast=True)
+        lcd.print("Hello")
+        lcd.create_char(location=2, charmap=[0x1F] * 8)
+        lcd.blink()
+        lcd.no_backlight()
+        lcd.set_cursor(col=3, row=1)
+
+        state = lcd.get_state()
+        self.assertEqual(len(state), Const.STATE_SIZE)
+
+        restored = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c,
+                       freq=400_000, framebuffer=True)
+        self.assertFalse(restored.set_state(state=b''))
+        self.assertFalse(restored.set_state(state=bytes(Const.STATE_SIZE)))
+        self.assertFalse(LCD(addr=0x27, cols=20, rows=4,
+                             i2c=self.i2c).set_state(state=state))
+
+        self.assertTrue(restored.set_state(state=state))
+        self.assertEqual(restored.get_state(), state)
+        self.assertEqual(restored.backlightval, Const.LCD_NOBACKLIGHT)
+        self.assertEqual(restored.cursor_position, (3, 1))
+        self.assertEqual(restored._cgram[16:24], bytes([0x1F] * 8))
+        self.assertEqual(restored._cgram_valid, 0x04)
+        self.assertEqual(restored.framebuffer[:5], b'Hello')
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            restored.resume()
+        self.assertTrue(restored._shadow_valid)
+        self.assertEqual(restored._shift, 0)
+        self._written = self._written[3:]
+        self.assertEqual(
+            self._sent()[2:],
+            [(0, Const.LCD_DISPLAYCONTROL | 0x5),
+             (0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT)]
+        )
+
+        # only the changed cells are sent after redrawing the content
+        restored.clear()
+        restored.print("Hello!")
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            restored.show()
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x05), (1, ord('!'))]
+        )
+
+    def test_batch(self) -> None:
+        """Test collecting the frames of several calls in a batch"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        self._written = []
+
+        with patch.object(I2C, 'writeto',
+                          side_effect=self._writeto) as mock_writeto:
+            with lcd.batch():
+                lcd.set_cursor(col=0, row=1)
+                lcd.print("Hello")
+                lcd.cursor()
+                lcd.blink()
+                mock_writeto.assert_not_called()
+            self.assertEqual(mock_writeto.call_count, 1)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+                [(1, ord(c)) for c in "Hello"] +
+                [(0, Const.LCD_DISPLAYCONTROL | 0x6),
+                 (0, Const.LCD_DISPLAYCONTROL | 0x7)]
+            )
+
+            # split after clear display and if the frame buffer is full,
+            # nested batches are sent when leaving the outermost one
+            mock_writeto.reset_mock()
+            with lcd.batch():
+                lcd.no_blink()
+                lcd._clear_display()
+                self.assertEqual(mock_writeto.call_count, 1)
+                with lcd.batch():
+                    lcd.print("A" * 20)
+                self.assertEqual(mock_writeto.call_count, 2)
+            self.assertEqual(mock_writeto.call_count, 3)
+            self.assertEqual(
+                self._sent(),
+                [(0, Const.LCD_DISPLAYCONTROL | 0x6),
+                 (0, Const.LCD_CLEARDISPLAY)] +
+                [(1, ord('A'))] * 20
+            )
+
+            # collected frames are sent before writing the backlight
+            with lcd.batch():
+                lcd.print("B")
+                lcd.no_backlight()
+            self.assertEqual(self._written[0][0] & Const.LCD_BACKLIGHT,
+                             Const.LCD_BACKLIGHT)
+            self.assertEqual(self._written[1], bytes([0]))
+
+            # collected frames are sent before single nibbles
+            self._written = []
+            with lcd.batch():
+                lcd.set_cursor(col=3, row=1)
+                lcd.print("ab")
+                lcd.resume()
+            self.assertEqual(
+                decode(frames=self._written[0]),
+                [(0, Const.LCD_SETDDRAMADDR | 0x43),
+                 (1, ord('a')),
+                 (1, ord('b'))]
+            )
+            self.assertEqual(len(self._written[2]), Const.FRAME_SIZE // 2)
+
+    def test_writevto(self) -> None:
+        """Test sending frames as vector of lookup table entries"""
+        class VectorI2C(I2C):
+            """Fake MicroPython I2C class with scatter-gather support"""
+            def writevto(addr: int, vector: list, stop: bool = True) -> int:
+                return 1
+
+        i2c = VectorI2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=i2c, vectored=True)
+        lcd._display_function = Const.LCD_2LINE
+        lcd._display_mode = Const.LCD_ENTRYLEFT
+        lcd._address = 0
+        vectors = []
+
+        def writevto(addr: int, vector: list) -> None:
+            vectors.append([bytes(frame) for frame in vector])
+
+        with patch.object(VectorI2C, 'writeto') as mock_writeto:
+            with patch.object(VectorI2C, 'writevto',
+                              side_effect=writevto) as mock_writevto:
+                lcd.set_cursor(col=0, row=1)
+                lcd.print("Hi")
+                with lcd.batch():
+                    lcd.print("!")
+                    lcd.cursor()
+
+        mock_writeto.assert_not_called()
+        self.assertEqual(mock_writevto.call_count, 3)
+        self.assertEqual(len(vectors[1]), 2)
+        self._written = [b''.join(vector) for vector in vectors]
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETDDRAMADDR | 0x40),
+             (1, ord('H')), (1, ord('i')), (1, ord('!')),
+             (0, Const.LCD_DISPLAYCONTROL | Const.LCD_CURSORON)]
+        )
+
+        # vectors are prepared, sending them does not allocate
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for row in range(0, 2):
+                lcd.set_cursor(col=0, row=row)
+                lcd.print("Steady state 123")
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        only_driver = [tracemalloc.Filter(True, '*lcd_i2c*lcd_i2c.py')]
+        stats = after.filter_traces(only_driver).compare_to(
+            before.filter_traces(only_driver), 'lineno')
+        self.assertEqual(sum(stat.count_diff for stat in stats), 0)
+
+        # single nibbles are no vector
+        with patch.object(VectorI2C, 'writeto') as mock_writeto:
+            with patch.object(VectorI2C, 'writevto') as mock_writevto:
+                lcd._write_nibble(value=0x03)
+        mock_writeto.assert_called_once()
+        mock_writevto.assert_not_called()
+
+        # fall back to writeto if not wanted or not supported
+        for lcd in (LCD(addr=0x27, cols=16, rows=2, i2c=i2c),
+                    LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c,
+                        vectored=True)):
+            with patch.object(I2C, 'writeto') as mock_writeto:
+                with patch.object(VectorI2C, 'writevto') as mock_writevto:
+                    lcd.print("Hi")
+            mock_writeto.assert_called()
+            mock_writevto.assert_not_called()
+
+    def test_max_transfer(self) -> None:
+        """Test splitting writes into transactions of a maximum size"""
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c)
+        self.assertEqual(lcd.max_transfer, 0)
+        self.assertEqual(lcd._frames_per_write, 21)
+
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c, max_transfer=32)
+        self.assertEqual(lcd.max_transfer, 32)
+        lcd._display_function = Const.LCD_2LINE
+        lcd._display_mode = Const.LCD_ENTRYLEFT
+        lcd._address = 0
+        text = "Hello World, how are"
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print(text)
+        self.assertEqual([len(buf) for buf in self._written],
+                         [30, 30, 30, 30])
+        self.assertEqual(self._sent(), [(1, ord(c)) for c in text])
+
+        # never split within the frame of a byte
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.max_transfer = 4
+            lcd.print("Hi")
+        self.assertEqual([len(buf) for buf in self._written], [6, 6])
+
+        # changing the size sends the frames collected by a batch
+        lcd.max_transfer = 0
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            with lcd.batch():
+                lcd.print("Hi")
+                lcd.max_transfer = 6
+                self.assertEqual(len(self._written), 3)
+                lcd.print("!")
+        self.assertEqual([len(buf) for buf in self._written], [6, 6, 12, 6])
+
+    def test_bus_sharing(self) -> None:
+        """Test bounding the bus time and yielding between transactions"""
+        events = []
+
+        class BusLock(object):
+            """Fake lock recording its usage"""
+            def acquire(self) -> None:
+                events.append('acquire')
+
+            def release(self) -> None:
+                events.append('release')
+
+        def writeto(addr: int, buf: bytearray) -> None:
+            events.append(len(buf))
+
+        lcd = LCD(addr=0x27, cols=20, rows=4, i2c=self.i2c, freq=400_000,
+                  max_hold_us=300, bus_lock=BusLock(),
+                  yield_hook=lambda: events.append('yield'))
+        self.assertEqual(lcd.max_hold_us, 300)
+        # a frame takes 135us at 400kHz
+        self.assertEqual(lcd._frames_per_write, 2)
+        lcd._display_function = Const.LCD_2LINE
+        lcd._display_mode = Const.LCD_ENTRYLEFT
+        lcd._address = 0
+
+        with patch.object(I2C, 'writeto', side_effect=writeto):
+            lcd.print("Hello")
+        self.assertEqual(events, ['acquire', 12, 'release', 'yield'] * 2 +
+                                 ['acquire', 6, 'release', 'yield'])
+
+        # both limits apply, at least one frame is sent at once
+        lcd.max_transfer = 6
+        self.assertEqual(lcd._frames_per_write, 1)
+        lcd.max_transfer = 0
+        lcd.max_hold_us = 10
+        self.assertEqual(lcd._frames_per_write, 1)
+        lcd.max_hold_us = 0
+        self.assertEqual(lcd._frames_per_write, 21)
+
+        # the lock is released on bus errors and held for busy flag reads
+        events.clear()
+        with patch.object(I2C, 'writeto', side_effect=OSError):
+            with self.assertRaises(OSError):
+                lcd.print("!")
+        self.assertEqual(events, ['acquire', 'release'])
+
+        events.clear()
+        with patch.object(I2C, 'writeto', side_effect=writeto):
+            lcd._read_busy_address()
+        self.assertEqual(events, ['acquire', 2, 2, 1, 'release'])
+
+    def test_load_glyph(self) -> None:
+        """Test managing custom characters by their charmap"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        glyphs = [[num] * 8 for num in range(0, 12)]
+
+        for num in range(0, 8):
+            self.assertEqual(lcd.load_glyph(charmap=glyphs[num]), num)
+        self.assertEqual(lcd._cgram_valid, 0xFF)
+
+        # resident custom characters are not uploaded again
+        with patch.object(I2C, 'writeto') as mock_writeto:
+            self.assertEqual(lcd.load_glyph(charmap=glyphs[0]), 0)
+            self.assertEqual(lcd.load_glyph(charmap=glyphs[5] + [0xE0]), 5)
+            self.assertEqual(lcd.load_glyph(charmap=glyphs[6]), 6)
+        mock_writeto.assert_not_called()
+
+        # the least recently used ones not shown are replaced
+        lcd.set_cursor(col=0, row=0)
+        lcd.print("".join(chr(num) for num in range(0, 4)))
+        lcd.print(chr(8 + 7))
+        with patch.object(I2C, 'writeto') as mock_writeto:
+            self.assertEqual(lcd.load_glyph(charmap=glyphs[8]), 4)
+        self.assertEqual(mock_writeto.call_count, 9)
+        self.assertEqual(lcd._cgram[32:40], bytes(glyphs[8]))
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[9]), 5)
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[10]), 6)
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[0]), 0)
+
+        # all shown, nothing can be replaced
+        lcd.set_cursor(col=5, row=0)
+        lcd.print("".join(chr(num) for num in range(4, 7)))
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[11]), -1)
+
+        # unknown display content is assumed to show all
+        lcd.set_cursor(col=0, row=0)
+        lcd.print(" " * 16)
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[11]), 1)
+        lcd._shadow_valid = False
+        self.assertEqual(lcd.load_glyph(charmap=glyphs[1]), -1)
+
+    def test_create_chars(self) -> None:
+        """Test streaming several custom characters with one CGRAM address"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd._display_function = Const.LCD_2LINE
+        lcd._display_mode = Const.LCD_ENTRYLEFT
+        lcd._address = 0x45
+        charset = [[location + row for row in range(0, 8)]
+                   for location in range(0, 8)]
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.load_charset(charset=charset)
+
+        # a CGRAM address, 64 rows and the restored DDRAM address
+        self.assertEqual(len(self._written), 4)
+        sent = self._sent()
+        self.assertEqual(sent[0], (0, Const.LCD_SETCGRAMADDR))
+        self.assertEqual(sent[1:65],
+                         [(Const.RS, value) for charmap in charset
+                          for value in charmap])
+        self.assertEqual(sent[65], (0, Const.LCD_SETDDRAMADDR | 0x45))
+        self.assertEqual(lcd._address, 0x45)
+        self.assertEqual(lcd._cgram, bytes(value for charmap in charset
+                                           for value in charmap))
+        self.assertEqual(lcd._cgram_valid, 0xFF)
+
+        # address is only set again after a gap, unknown address is kept
+        lcd._address = -1
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.create_chars(charmaps={
+                5: [0x1F] * 8, 1: [0x01] * 8, 2: [0x02] * 8
+            })
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETCGRAMADDR | 1 << 3)] +
+            [(Const.RS, 0x01)] * 8 + [(Const.RS, 0x02)] * 8 +
+            [(0, Const.LCD_SETCGRAMADDR | 5 << 3)] +
+            [(Const.RS, 0x1F)] * 8
+        )
+        self.assertEqual(lcd._address, -1)
+        self.assertEqual(lcd.load_glyph(charmap=[0x1F] * 8), 5)
+
+        # nothing to send without characters
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.create_chars(charmaps={})
+        self.assertEqual(self._written, [])
+
+    def test_update_char(self) -> None:
+        """Test only the changed rows of a custom character are written"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd._address = 0x05
+        charmap = [0x00] * 8
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            # unknown content is written completely
+            lcd.update_char(location=3, charmap=charmap)
+            self.assertEqual(len(self._sent()), 10)
+
+            # nothing changed, nothing to send
+            lcd.update_char(location=3, charmap=charmap)
+            self.assertEqual(self._written, [])
+
+            # address is only set again after unchanged rows
+            charmap[1] = 0x01
+            charmap[2] = 0x02
+            charmap[6] = 0x06
+            lcd.update_char(location=3, charmap=charmap)
+
+        self.assertEqual(
+            self._sent(),
+            [(0, Const.LCD_SETCGRAMADDR | 25),
+             (Const.RS, 0x01),
+             (Const.RS, 0x02),
+             (0, Const.LCD_SETCGRAMADDR | 30),
+             (Const.RS, 0x06),
+             (0, Const.LCD_SETDDRAMADDR | 0x05)]
+        )
+        self.assertEqual(lcd._cgram[24:32], bytes(charmap))
+        self.assertEqual(lcd._address, 0x05)
 
     def tearDown(self) -> None:
         """Run after every test method"""
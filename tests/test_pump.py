@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the non-blocking I2C LCD write pump"""
+
+from unittest.mock import Mock, patch
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin, ticks_diff, ticks_us
+from lcd_i2c import const as Const
+from lcd_i2c.pump import PumpLCD
+
+
+class TestPumpLCD(FrameRecorder, unittest.TestCase):
+    """This class describes a TestPumpLCD unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        self._written: list = []
+
+    def _lcd(self, **kwargs) -> PumpLCD:
+        """Create a started LCD with a known address counter"""
+        lcd = PumpLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, **kwargs)
+        lcd.begin(fast=True)
+
+        return lcd
+
+    def test_pump(self) -> None:
+        """Test frames are queued and sent by the pump"""
+        lcd = self._lcd(frames_per_tick=4)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            # not started, frames are sent directly
+            lcd.print("Hi")
+            self.assertEqual(len(self._written), 1)
+            self._written = []
+
+            lcd.start()
+            # display content unknown, the clear instruction is sent
+            lcd._shadow_valid = False
+            lcd.clear()
+            lcd.print("Hello World")
+            self.assertEqual(self._written, [])
+            # clear display and its marker, 11 characters
+            self.assertEqual(lcd.queued, 6 + 2 + 11 * 6)
+
+            lcd._busy_until = ticks_us()
+            lcd.pump()
+            self.assertEqual(self._sent(), [(0, Const.LCD_CLEARDISPLAY)])
+            waited = ticks_diff(lcd._busy_until, ticks_us())
+            self.assertGreater(waited, Const.EXEC_TIME_US)
+            self.assertLessEqual(waited, 1600)
+
+            # controller still busy with clear display
+            lcd.pump()
+            self.assertEqual(self._written, [])
+
+            lcd._busy_until = ticks_us()
+            lcd.pump()
+            self.assertEqual(self._sent(), [(1, ord(c)) for c in "Hell"])
+
+            lcd.stop()
+            self.assertEqual(len(self._written), 2)
+            self.assertEqual(self._sent(), [(1, ord(c)) for c in "o World"])
+            self.assertEqual(lcd.queued, 0)
+
+            # stopped, frames are sent directly again
+            lcd.print("!")
+            self.assertEqual(self._sent(), [(1, ord('!'))])
+
+    def test_backlight(self) -> None:
+        """Test queued frames are sent before the backlight changes"""
+        lcd = self._lcd()
+        lcd.start()
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("hello")
+            lcd.no_backlight()
+            lcd.flush()
+
+        # queued frames keep the backlight on, the last write turns it off
+        self.assertEqual(self._written[-1], bytes([Const.LCD_NOBACKLIGHT]))
+        frames = b''.join(self._written[:-1])
+        self.assertEqual(len(frames), 5 * Const.FRAME_SIZE)
+        self.assertTrue(all(value & Const.LCD_BACKLIGHT for value in frames))
+        self.assertFalse(lcd.get_backlight())
+
+    def test_resume(self) -> None:
+        """Test single nibbles are sent after the queued frames"""
+        lcd = self._lcd(freq=400_000)
+        lcd.start()
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("hi")
+            lcd.resume()
+            lcd.print("ab")
+            lcd.flush()
+
+        # frames, nibbles and the port expander byte stay aligned and keep
+        # the backlight on
+        nibbles = [buf for buf in self._written if len(buf) == 3]
+        self.assertEqual(len(nibbles), 2)
+        for buf in self._written:
+            self.assertIn(len(buf) % Const.FRAME_SIZE, (0, 1, 3))
+            self.assertTrue(all(value & Const.LCD_BACKLIGHT for value in buf))
+        self.assertEqual(
+            self._sent()[:8],
+            [(1, ord('h')), (1, ord('i')),
+             (0, 0x32),
+             (0, Const.LCD_FUNCTIONSET | Const.LCD_2LINE),
+             (0, Const.LCD_DISPLAYCONTROL | Const.LCD_DISPLAYON),
+             (0, Const.LCD_ENTRYMODESET | Const.LCD_ENTRYLEFT),
+             (1, ord('a')), (1, ord('b'))]
+        )
+        self.assertEqual(lcd.queued, 0)
+
+    def test_pump_during_drain(self) -> None:
+        """Test a pump running while the main context drains is skipped"""
+        for policy in (Const.PUMP_BLOCK, Const.PUMP_COALESCE):
+            lcd = self._lcd(queue_size=0, policy=policy)
+            lcd.start()
+
+            def writeto(addr: int, buf: bytearray) -> None:
+                self._writeto(addr=addr, buf=buf)
+                # scheduled pump between two bytecodes of the main context
+                lcd.pump()
+
+            with patch.object(I2C, 'writeto', side_effect=writeto):
+                lcd.print("A" * 16)
+                lcd.flush()
+
+            self.assertEqual(self._sent(), [(1, ord('A'))] * 16)
+
+    def test_bus_sharing(self) -> None:
+        """Test the pump holds the bus lock and yields like the LCD"""
+        events = []
+
+        class BusLock(object):
+            """Fake lock recording its usage"""
+            def acquire(self) -> None:
+                events.append('acquire')
+
+            def release(self) -> None:
+                events.append('release')
+
+        def writeto(addr: int, buf: bytearray) -> None:
+            events.append(len(buf))
+
+        lcd = self._lcd(frames_per_tick=4, bus_lock=BusLock(),
+                        yield_hook=lambda: events.append('yield'))
+        events.clear()
+        lcd.start()
+        # limit set after the construction applies to the pump as well
+        lcd.max_transfer = 12
+
+        with patch.object(I2C, 'writeto', side_effect=writeto):
+            lcd.print("Hello")
+            lcd.flush()
+
+        self.assertEqual(events, ['acquire', 12, 'release', 'yield'] * 2 +
+                                 ['acquire', 6, 'release', 'yield'])
+
+    def test_overflow_block(self) -> None:
+        """Test the caller drains the ring buffer if it is full"""
+        lcd = self._lcd(queue_size=0, frames_per_tick=2)
+        lcd.start()
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("A" * 16)
+            lcd.set_cursor(col=0, row=1)
+            lcd.print("B" * 16)
+            self.assertGreater(len(self._written), 0)
+            lcd.flush()
+
+        self.assertEqual(
+            self._sent(),
+            [(1, ord('A'))] * 16 +
+            [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+            [(1, ord('B'))] * 16
+        )
+        self.assertEqual(lcd.dropped, 0)
+
+    def test_overflow_drop_oldest(self) -> None:
+        """Test the oldest frames are dropped if the ring buffer is full"""
+        lcd = self._lcd(queue_size=0, policy=Const.PUMP_DROP_OLDEST)
+        lcd.start()
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("A" * 16)
+            lcd.set_cursor(col=0, row=1)
+            self.assertEqual(lcd.dropped, 0)
+            lcd.print("B" * 2)
+            self.assertEqual(self._written, [])
+            # the address is unknown after dropping and set again
+            self.assertEqual(lcd.dropped, 3)
+            self.assertEqual(lcd._address, 0x42)
+            lcd.flush()
+
+        self.assertEqual(
+            self._sent(),
+            [(1, ord('A'))] * 13 +
+            [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+            [(1, ord('B'))] * 2 +
+            [(0, Const.LCD_SETDDRAMADDR | 0x42)]
+        )
+
+    def test_overflow_coalesce(self) -> None:
+        """Test showing the framebuffer is deferred while frames are queued"""
+        lcd = self._lcd(policy=Const.PUMP_COALESCE, framebuffer=True)
+        lcd.start()
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            for count in range(0, 100):
+                lcd.set_cursor(col=0, row=0)
+                lcd.print("{:3d}".format(count))
+                lcd.show()
+                if count % 10 == 0:
+                    lcd._busy_until = ticks_us()
+                    lcd.pump()
+            lcd.flush()
+
+        sent = self._sent()
+        self.assertLess(len(sent), 100)
+        self.assertEqual(bytes(lcd._shadow[:3]), b" 99")
+        self.assertEqual(sent[-2:], [(1, ord('9')), (1, ord('9'))])
+
+    def test_timer(self) -> None:
+        """Test the pump is scheduled by a timer"""
+        lcd = self._lcd()
+        timer = Mock()
+
+        lcd.start(timer=timer, period_ms=2)
+        kwargs = timer.init.call_args[1]
+        self.assertEqual(kwargs['period'], 2)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.print("Hi")
+            lcd._busy_until = ticks_us()
+            kwargs['callback'](timer)
+            self.assertEqual(self._sent(), [(1, ord('H')), (1, ord('i'))])
+
+            # pump is skipped while frames are queued
+            lcd._ring_busy = True
+            lcd.print("!")
+            lcd._ring_busy = False
+            kwargs['callback'](timer)
+
+        lcd.stop()
+        timer.deinit.assert_called_once()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
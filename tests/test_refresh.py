@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the LCD refresh scheduler"""
+
+import asyncio
+import importlib
+from unittest.mock import Mock, patch
+import sys
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import I2C, Pin
+import lcd_i2c
+from lcd_i2c import LCD
+from lcd_i2c.async_lcd import AsyncLCD
+from lcd_i2c.refresh import RefreshScheduler
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    """This class describes a TestRefreshScheduler unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+
+    def test_framebuffer_required(self) -> None:
+        """Test the LCD has to be in framebuffer mode"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        with self.assertRaises(ValueError):
+            RefreshScheduler(lcd=lcd)
+
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        for fps in (0, -1):
+            with self.assertRaises(ValueError):
+                RefreshScheduler(lcd=lcd, fps=fps)
+
+        scheduler = RefreshScheduler(lcd=lcd, fps=25)
+        self.assertEqual(scheduler.period_ms, 40)
+        self.assertFalse(scheduler.running)
+
+    def test_run(self) -> None:
+        """Test chatty producers are coalesced to the frame rate"""
+        for lcd_class in (LCD, AsyncLCD):
+            lcd = lcd_class(addr=0x27, cols=16, rows=2, i2c=self.i2c,
+                            framebuffer=True)
+            scheduler = RefreshScheduler(lcd=lcd, fps=50)
+
+            async def producer() -> None:
+                for count in range(0, 500):
+                    lcd.set_cursor(col=0, row=0) \
+                        if lcd_class is LCD else \
+                        await lcd.set_cursor(col=0, row=0)
+                    lcd._print_framebuffer(text="{:5d}".format(count))
+                    if count % 50 == 0:
+                        await asyncio.sleep(0.01)
+                await asyncio.sleep(0.05)
+                scheduler.stop()
+
+            async def run() -> None:
+                lcd.begin(fast=True) \
+                    if lcd_class is LCD else \
+                    await lcd.begin(fast=True)
+                await asyncio.gather(scheduler.run(), producer())
+
+            with patch.object(lcd, 'show', wraps=lcd.show) as mock_show:
+                asyncio.run(run())
+
+            # about 0.15s at 50 fps instead of 500 prints
+            self.assertGreater(mock_show.call_count, 1)
+            self.assertLess(mock_show.call_count, 15)
+            self.assertEqual(lcd._shadow[:5], b"  499")
+            self.assertFalse(scheduler.running)
+
+    def test_timer(self) -> None:
+        """Test refreshes scheduled by a timer"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        lcd.begin(fast=True)
+        scheduler = RefreshScheduler(lcd=lcd, fps=20)
+        timer = Mock()
+
+        scheduler.start_timer(timer=timer)
+        self.assertTrue(scheduler.running)
+        kwargs = timer.init.call_args[1]
+        self.assertEqual(kwargs['period'], 50)
+
+        lcd.print("Hi")
+        with patch.object(I2C, 'writeto') as mock_writeto:
+            kwargs['callback'](timer)
+            self.assertEqual(mock_writeto.call_count, 1)
+            self.assertEqual(lcd._shadow[:2], b"Hi")
+
+            # a refresh scheduled before the stop is skipped
+            scheduler.stop()
+            timer.deinit.assert_called_once()
+            lcd.print("!")
+            scheduler._timer._scheduled_cb(None)
+            self.assertEqual(mock_writeto.call_count, 1)
+
+    def test_without_asyncio(self) -> None:
+        """Test refreshes by a timer do not need asyncio"""
+        lcd = LCD(addr=0x27, cols=16, rows=2, i2c=self.i2c, framebuffer=True)
+        lcd.begin(fast=True)
+        lcd.print("Hi")
+
+        # modules imported without asyncio are dropped afterwards
+        with patch.dict(sys.modules, {'asyncio': None}), \
+                patch.object(lcd_i2c, 'refresh', lcd_i2c.refresh):
+            sys.modules.pop('lcd_i2c.async_lcd', None)
+            sys.modules.pop('lcd_i2c.refresh', None)
+            refresh = importlib.import_module('lcd_i2c.refresh')
+            self.assertNotIn('lcd_i2c.async_lcd', sys.modules)
+
+            scheduler = refresh.RefreshScheduler(lcd=lcd, fps=20)
+            timer = Mock()
+            scheduler.start_timer(timer=timer)
+            with patch.object(I2C, 'writeto') as mock_writeto:
+                timer.init.call_args[1]['callback'](timer)
+            mock_writeto.assert_called_once()
+            self.assertEqual(lcd._shadow[:2], b"Hi")
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
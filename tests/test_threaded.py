@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the threaded I2C LCD render worker"""
+
+from unittest.mock import patch
+import threading
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+from fakes import FrameRecorder, I2C, Pin
+from lcd_i2c import const as Const
+from lcd_i2c.threaded import ThreadedLCD
+
+
+class TestThreadedLCD(FrameRecorder, unittest.TestCase):
+    """This class describes a TestThreadedLCD unittest."""
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self.i2c = I2C(1, scl=Pin(3), sda=Pin(2), freq=800_000)
+        self._written: list = []
+        self._threads: set = set()
+
+    def _writeto(self, addr: int, buf: bytearray) -> None:
+        """Keep a copy of the written data and the writing thread"""
+        super()._writeto(addr=addr, buf=buf)
+        self._threads.add(threading.get_ident())
+
+    def test_worker(self) -> None:
+        """Test the worker thread renders the shown framebuffers"""
+        lcd = ThreadedLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        self.assertIsNotNone(lcd.framebuffer)
+        lcd.begin(fast=True)
+
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.start()
+            self.assertTrue(lcd.running)
+
+            lcd.print("Hello")
+            lcd.set_cursor(col=0, row=1)
+            lcd.print("World")
+            lcd.show()
+            lcd.flush()
+
+            self.assertEqual(
+                self._sent(),
+                [(1, ord(c)) for c in "Hello"] +
+                [(0, Const.LCD_SETDDRAMADDR | 0x40)] +
+                [(1, ord(c)) for c in "World"]
+            )
+
+            # framebuffers shown while the worker is busy are coalesced
+            for count in range(0, 200):
+                lcd.set_cursor(col=0, row=0)
+                lcd.print("{:5d}".format(count))
+                lcd.show()
+            lcd.stop()
+            self.assertFalse(lcd.running)
+
+        self.assertEqual(bytes(lcd._shadow[:5]), b"  199")
+        self.assertNotIn(threading.get_ident(), self._threads)
+        self.assertLess(len(self._written), 200)
+
+        # without worker the framebuffer is shown directly
+        with patch.object(I2C, 'writeto', side_effect=self._writeto):
+            lcd.clear()
+            lcd.show()
+        self.assertIn(threading.get_ident(), self._threads)
+        self.assertEqual(bytes(lcd._shadow), b" " * 32)
+
+    def test_show_while_rendering(self) -> None:
+        """Test a framebuffer shown during a render is not lost"""
+        lcd = ThreadedLCD(addr=0x27, cols=16, rows=2, i2c=self.i2c)
+        lcd.begin(fast=True)
+        rendering = threading.Event()
+        release = threading.Event()
+
+        def slow_writeto(addr: int, buf: bytearray) -> None:
+            self._writeto(addr=addr, buf=buf)
+            if not rendering.is_set():
+                rendering.set()
+                release.wait(timeout=5)
+
+        with patch.object(I2C, 'writeto', side_effect=slow_writeto):
+            lcd.start()
+            lcd.print("A" * 16)
+            lcd.show()
+            self.assertTrue(rendering.wait(timeout=5))
+
+            # worker is blocked inside the render with pending frames
+            lcd.set_cursor(col=0, row=1)
+            lcd.print("BBBB")
+            lcd.show()
+            release.set()
+            lcd.flush()
+            lcd.stop()
+
+        self.assertEqual(bytes(lcd._shadow), b"A" * 16 + b"BBBB" + b" " * 12)
+        self.assertIn((1, ord('B')), self._sent())
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
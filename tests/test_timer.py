@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Unittest for the scheduled timer"""
+
+from unittest.mock import Mock, patch
+import unittest
+
+# fake MicroPython modules, registered before the package is imported
+import fakes  # noqa: F401
+from lcd_i2c.timer import ScheduledTimer
+
+
+class TestScheduledTimer(unittest.TestCase):
+    """This class describes a TestScheduledTimer unittest."""
+
+    def test_timer(self) -> None:
+        """Test the function is scheduled by the timer callback"""
+        func = Mock()
+        scheduled = ScheduledTimer(func=func)
+        timer = Mock()
+        self.assertFalse(scheduled.running)
+
+        scheduled.start(timer=timer, period_ms=20)
+        self.assertTrue(scheduled.running)
+        kwargs = timer.init.call_args[1]
+        self.assertEqual(kwargs['mode'], timer.PERIODIC)
+        self.assertEqual(kwargs['period'], 20)
+
+        with patch('lcd_i2c.timer.schedule') as mock_schedule:
+            kwargs['callback'](timer)
+        mock_schedule.assert_called_once_with(scheduled._scheduled_cb, None)
+        func.assert_not_called()
+
+        scheduled._scheduled_cb(None)
+        func.assert_called_once_with()
+
+        # a full schedule queue skips the period
+        with patch('lcd_i2c.timer.schedule',
+                   side_effect=RuntimeError) as mock_schedule:
+            kwargs['callback'](timer)
+        mock_schedule.assert_called_once()
+        func.assert_called_once_with()
+
+        scheduled.stop()
+        self.assertFalse(scheduled.running)
+        timer.deinit.assert_called_once()
+        scheduled.stop()
+        timer.deinit.assert_called_once()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()